@@ -0,0 +1,35 @@
+def parse_attribute_pairs(str column):
+    """
+    Splits the attribute column of a GFF line into (key, value) pairs,
+    with the same rules as :func:`mgkit.io.gff.from_gff`: the key/value
+    separator is a '=', falling back to a space (GTF style) and to a None
+    value when the attribute has no value (flag). Quote removal, duplicate
+    handling and URL unquoting are left to the caller.
+    """
+    cdef list pairs = []
+    cdef str pair, var, value
+    cdef Py_ssize_t idx
+
+    for pair in column.split(';'):
+        pair = pair.strip()
+
+        if not pair:
+            continue
+
+        idx = pair.find('=')
+
+        if idx >= 0:
+            var = pair[:idx]
+            value = pair[idx + 1:]
+        else:
+            idx = pair.find(' ')
+            if idx >= 0:
+                var = pair[:idx]
+                value = pair[idx + 1:]
+            else:
+                var = pair
+                value = None
+
+        pairs.append((var, value))
+
+    return pairs
@@ -4,6 +4,7 @@ Simple fasta parser and a few utility functions
 """
 import itertools
 import logging
+import mmap
 from builtins import range
 import mgkit.io
 
@@ -130,6 +131,87 @@ def load_fasta_prodigal(file_handle):
         )
 
 
+class MmapFasta(object):
+    """
+    .. versionadded:: 0.5.8
+
+    Read-only, dict-like access to the sequences of a FASTA file. The file
+    is memory-mapped and scanned once to index the position of each
+    sequence, so the whole file is never loaded in memory: a sequence is
+    only materialised (newlines stripped, uppercased) when accessed by
+    name.
+
+    Arguments:
+        file_handle (str, file): FASTA file to index; a file name or a
+            binary file handle backed by a real file (not compressed)
+        rename (bool): if True the sequence names are truncated at the
+            first space (BLAST behaviour), like
+            :func:`load_fasta_rename`
+    """
+    def __init__(self, file_handle, rename=False):
+        if isinstance(file_handle, str):
+            file_handle = open(file_handle, 'rb')
+
+        if getattr(file_handle, 'name', None) is not None:
+            LOG.info("Indexing fasta file %s", file_handle.name)
+
+        self._mmap = mmap.mmap(
+            file_handle.fileno(), 0, access=mmap.ACCESS_READ
+        )
+        self._index = {}
+
+        name = None
+        seq_start = None
+        seq_len = 0
+
+        while True:
+            line_start = self._mmap.tell()
+            line = self._mmap.readline()
+            if not line:
+                break
+            if line.startswith(b'>'):
+                if name is not None:
+                    self._index[name] = (seq_start, line_start, seq_len)
+                name = line[1:].strip().decode('ascii')
+                if rename:
+                    name = name.split(' ')[0]
+                seq_start = self._mmap.tell()
+                seq_len = 0
+            else:
+                seq_len += len(line.strip())
+
+        if name is not None:
+            self._index[name] = (seq_start, self._mmap.size(), seq_len)
+
+        LOG.info("Indexed %d fasta sequences", len(self._index))
+
+    def __getitem__(self, name):
+        start, end, _ = self._index[name]
+        return self._mmap[start:end].translate(
+            None, delete=b'\r\n'
+        ).decode('ascii').upper()
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def length(self, name):
+        "Returns the length of sequence *name* without materialising it"
+        return self._index[name][2]
+
+    def lengths(self):
+        "Returns a dictionary name -> sequence length"
+        return dict(
+            (name, value[2])
+            for name, value in self._index.items()
+        )
+
+
 def write_fasta_sequence(file_handle, name, seq, wrap=60, write_mode='a'):
     """
     Write a fasta sequence to file. If the *file_handle* is a string, the file
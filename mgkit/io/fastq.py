@@ -188,6 +188,9 @@ def load_fastq(file_handle, num_qual=False):
     """
     .. versionadded:: 0.3.1
 
+    .. versionchanged:: 0.5.8
+        a truncated record at the end of the file raises ValueError
+
     Loads a fastq file and returns a generator of tuples in which the first
     element is the name of the sequence, the second the sequence and the third
     the quality scores (converted in a numpy array if *num_qual* is True).
@@ -228,16 +231,25 @@ def load_fastq(file_handle, num_qual=False):
 
     sequence_count = 0
 
-    while True:
-        header1 = file_handle.readline().decode('ascii').strip()
+    # iterating the file object (instead of calling readline in a loop)
+    # goes through its readahead buffer
+    line_iter = iter(file_handle)
+
+    for header1 in line_iter:
+        header1 = header1.decode('ascii').strip()
         # Reached the end of the file
         if not header1:
             break
 
-        seq = file_handle.readline().decode('ascii').strip()
+        try:
+            seq = next(line_iter).decode('ascii').strip()
 
-        header2 = file_handle.readline().decode('ascii').strip()
-        qualities = file_handle.readline().decode('ascii').strip()
+            header2 = next(line_iter).decode('ascii').strip()
+            qualities = next(line_iter).decode('ascii').strip()
+        except StopIteration:
+            raise ValueError(
+                "Truncated record at the end of the file '{}'".format(header1)
+            )
 
         if (header1[0] != '@') or (header2[0] != '+'):
             raise ValueError(
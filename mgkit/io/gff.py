@@ -7,6 +7,7 @@ from io import IOBase
 import random
 import itertools
 import logging
+import sys
 import uuid
 import json
 from future.utils import viewitems
@@ -17,6 +18,7 @@ except ImportError:
     # Python3
     from urllib.parse import unquote, quote
 import mgkit.io
+from ._gff_attr import parse_attribute_pairs
 from ..mappings.eggnog import EGGNOG_CAT
 from ..utils import sequence as seq_utils
 from ..consts import MIN_COV
@@ -1216,6 +1218,12 @@ def from_gff(line, strict=True, encoding='ascii'):
     .. versionchanged:: 0.4.0
         added *encoding* parameter
 
+    .. versionchanged:: 0.5.8
+        the attribute column is tokenised by a compiled helper; empty
+        pairs (e.g. from a trailing ';') are now skipped, instead of
+        producing an empty attribute that was written back by
+        :meth:`Annotation.to_gff`
+
     Parse GFF line and returns an :class:`Annotation` instance
 
     Arguments:
@@ -1262,18 +1270,13 @@ def from_gff(line, strict=True, encoding='ascii'):
     if len(line) < 9:
         return Annotation(**attr)
 
-    for pair in line[-1].split(';'):
-        try:
-            # by default the key,value separator '=' is assumed to be used
-            var, value = pair.strip().split('=', 1)
-        except ValueError:
-            # in case it doesn't work, it is assumed to be a space
-            if ' ' in pair.strip():
-                var, value = pair.strip().split(' ', 1)
-            else:
-                # case in which there's an attribute but no value, like a bool
-                var = pair.strip()
-                value = None
+    # the tokenization of the attribute column is done in the compiled
+    # extension, the rest (duplicates, unquoting) stays here
+    for var, value in parse_attribute_pairs(line[-1]):
+        # the same few attribute names repeat on every line of a file:
+        # interning makes each key one shared string and the dict lookups
+        # use the pointer-equality fast path
+        var = sys.intern(var)
 
         if (var in attr):
             if strict:
@@ -1493,7 +1496,8 @@ def from_json(line):
 
 
 def from_hmmer(line, aa_seqs, feat_type='gene', source='HMMER',
-               db='CUSTOM', custom_profiles=True, noframe=False):
+               db='CUSTOM', custom_profiles=True, noframe=False,
+               aa_lens=None):
     """
     .. versionadded:: 0.1.15
         first implementation to move old scripts to new GFF specs
@@ -1507,11 +1511,17 @@ def from_hmmer(line, aa_seqs, feat_type='gene', source='HMMER',
     .. versionchanged:: 0.3.1
         added support for non mgkit-translated sequences (*noframe*)
 
+    .. versionchanged:: 0.5.8
+        *line* can be an already split line (a list of fields), to avoid
+        splitting it twice in the calling code; added *aa_lens* so the
+        sequence lengths can be precomputed by the caller
+
     Parse HMMER results (one line), it won't parse commented lines (starting
     with *#*)
 
     Arguments:
-        line (str): HMMER domain table line
+        line (str, list): HMMER domain table line, or its fields already
+            split on whitespace
         aa_seqs (dict): dictionary with amino-acid sequences (name->seq),
             used to get the correct nucleotide positions
         feat_type (str): string to be used in the 'feature type' column
@@ -1520,6 +1530,9 @@ def from_hmmer(line, aa_seqs, feat_type='gene', source='HMMER',
             taxonomy and reviewed information in the form
             KOID_TAXONID_TAXON-NAME(-nr)
         noframe (bool): if True, the sequence is assumed to be in frame f0
+        aa_lens (dict, None): optional dictionary name->length for the
+            sequences in *aa_seqs*, avoids materialising a sequence just
+            for its length
 
     Returns:
         A :class:`Annotation` instance
@@ -1532,7 +1545,8 @@ def from_hmmer(line, aa_seqs, feat_type='gene', source='HMMER',
     """
     if isinstance(line, bytes):
         line = line.decode('ascii')
-    line = line.split()
+    if isinstance(line, str):
+        line = line.split()
     if noframe:
         # no information on the frame is provided (already a protein, so f0)
         frame = 'f0'
@@ -1544,7 +1558,10 @@ def from_hmmer(line, aa_seqs, feat_type='gene', source='HMMER',
     t_to = int(line[18])
     # first get coordinate if sequence is reversed
     if frame.startswith('r'):
-        seq_len = len(aa_seqs[line[0]])
+        if aa_lens is not None:
+            seq_len = aa_lens[line[0]]
+        else:
+            seq_len = len(aa_seqs[line[0]])
         t_from, t_to = seq_utils.reverse_aa_coord(t_from, t_to, seq_len)
     # necessary only if frame information available
     if not noframe:
@@ -1890,6 +1907,108 @@ def annotation_coverage_sorted(annotations, seqs, strand=True):
         yield seq_id, ann_strand, covered / seq_len * 100
 
 
+def _parse_attribute_records(columns, attributes=None):
+    """
+    .. versionadded:: 0.5.8
+
+    Expands an iterable of GFF attribute columns into a list of
+    dictionaries; used by :func:`load_gff_dataframe`, possibly in worker
+    processes.
+    """
+    records = []
+
+    for column in columns:
+        record = {}
+        if isinstance(column, str):
+            for var, value in parse_attribute_pairs(column):
+                if not var:
+                    continue
+                if (attributes is not None) and (var not in attributes):
+                    continue
+                if value is not None:
+                    value = unquote(value.replace('"', ''))
+                record[var] = value
+        records.append(record)
+
+    return records
+
+
+def load_gff_dataframe(file_handle, attributes=None, num_procs=1):
+    """
+    .. versionadded:: 0.5.8
+
+    Loads a GFF file into a :class:`pandas.DataFrame`: the 8 standard
+    columns are parsed with the pandas C engine and the attribute column
+    is tokenised with the compiled splitter used by :func:`from_gff`.
+    Attribute values are unquoted but kept as strings, with one column per
+    attribute; for analytics this avoids building an
+    :class:`Annotation` object per line.
+
+    Arguments:
+        file_handle (str, file): file name or file handle of the GFF
+        attributes (None, iterable): if not None, only the attributes in
+            the iterable are kept
+        num_procs (int): if greater than 1, the attribute columns are
+            expanded in that number of worker processes
+
+    Returns:
+        DataFrame: one row per annotation, standard columns first,
+        followed by the attribute columns
+    """
+    import functools
+    import multiprocessing
+
+    import pandas
+
+    base_names = ['seq_id', 'source', 'feat_type', 'start', 'end', 'score',
+                  'strand', 'phase']
+
+    dataframe = pandas.read_csv(
+        mgkit.io.open_file(file_handle, 'rb'),
+        sep='\t',
+        header=None,
+        names=base_names + ['attributes'],
+        dtype={'seq_id': str, 'source': str, 'feat_type': str}
+    )
+
+    # directives/comments can appear anywhere in the file; their rows pad
+    # the numeric columns with NaN (which upcasts them to float64), so
+    # the integer columns are re-cast after dropping them
+    dataframe = dataframe[
+        ~dataframe['seq_id'].str.startswith('#')
+    ].reset_index(drop=True).astype(
+        {'start': 'int64', 'end': 'int64', 'phase': 'int64'}
+    )
+
+    columns = dataframe['attributes'].tolist()
+
+    if num_procs > 1:
+        chunk_size = max(1, (len(columns) + num_procs - 1) // num_procs)
+        chunks = [
+            columns[index:index + chunk_size]
+            for index in range(0, len(columns), chunk_size)
+        ]
+        with multiprocessing.Pool(num_procs) as pool:
+            records = list(itertools.chain(
+                *pool.map(
+                    functools.partial(
+                        _parse_attribute_records, attributes=attributes
+                    ),
+                    chunks
+                )
+            ))
+    else:
+        records = _parse_attribute_records(columns, attributes=attributes)
+
+    return pandas.concat(
+        [
+            dataframe[base_names],
+            pandas.DataFrame(records, index=dataframe.index)
+        ],
+        axis=1
+    )
+
+
 def group_annotations(annotations, key_func=lambda x: (x.seq_id, x.strand)):
     """
     .. versionadded:: 0.1.12
@@ -76,6 +76,9 @@ def open_file(file_name, mode='r'):
         when a file handle is detected, it is passed to :func:`compressed_handle`
         to detect if the handle is a compressed file
 
+    .. versionchanged:: 0.5.8
+        uncompressed files are opened with a 1 MiB buffer
+
     Opens a file using the extension as a guide to which module to use.
 
     .. note::
@@ -112,7 +115,9 @@ def open_file(file_name, mode='r'):
         else:
             file_handle = lzma.LZMAFile(file_name, mode)
     else:
-        file_handle = io.open(file_name, mode)
+        # a large buffer keeps the number of read/write syscalls low when
+        # streaming big files (GFF, FASTA) line by line
+        file_handle = io.open(file_name, mode, buffering=1 << 20)
 
     return file_handle
 
@@ -1,4 +1,4 @@
 """
 Package with functions/classes used in accessing network resources
 """
-from .utils import url_read, url_open
+from .utils import url_read, url_open, url_open_retry, url_read_cached
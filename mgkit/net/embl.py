@@ -1,6 +1,7 @@
 "Access EMBL Services"
 
 from builtins import range
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import re
 import gzip
@@ -170,6 +171,9 @@ def dbfetch(embl_ids, db='embl', contact=None, out_format='seqxml',
     """
     .. versionadded:: 0.1.12
 
+    .. versionchanged:: 0.5.8
+        the requests are sent concurrently, instead of one at a time
+
     Function that allows to use dbfetch service (REST). More information on the
     output formats and the database available at the
     `service page <http://www.ebi.ac.uk/Tools/dbfetch/syntax.jsp>`_
@@ -192,25 +196,37 @@ def dbfetch(embl_ids, db='embl', contact=None, out_format='seqxml',
     elif isinstance(embl_ids, (set, dict)):
         embl_ids = list(embl_ids)
 
-    entries = []
+    request_urls = []
 
     for idx in range(0, len(embl_ids), num_req):
 
-        if len(embl_ids) > num_req:
-            LOG.info("Downloading ids - range %d-%d", idx + 1, idx + num_req)
-
         request_params = "{db_id}/{entry_id}/{format}?style=raw".format(
             db_id=db,
             entry_id=','.join(embl_ids[idx:idx+num_req]),
             format=out_format
         )
 
-        request_url = URL_REST + request_params
+        request_urls.append(URL_REST + request_params)
 
         if mgkit.DEBUG:
-            LOG.debug(request_url)
+            LOG.debug(request_urls[-1])
+
+    if len(request_urls) > 1:
+        LOG.info(
+            "Downloading %d ids (%d requests)", len(embl_ids),
+            len(request_urls)
+        )
 
-        entries.append(url_read(request_url, agent=contact))
+    # the downloads are network-bound, so they are sent concurrently and
+    # the total wall time is close to the slowest request; the pool is
+    # capped to stay within EBI's courtesy limits
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        entries = list(
+            executor.map(
+                lambda request_url: url_read(request_url, agent=contact),
+                request_urls
+            )
+        )
 
     return entries
 
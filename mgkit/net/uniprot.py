@@ -1,10 +1,13 @@
 """
 Contains function and constants for Uniprot access
 """
-from builtins import range, zip
+import collections
+from concurrent.futures import ThreadPoolExecutor
+import csv
+import io
 import mgkit
 import logging
-from . import url_read
+from . import url_open_retry, url_read_cached
 
 UNIPROT_MAP = 'http://www.uniprot.org/mapping/'
 "URL to Uniprot mapping REST API"
@@ -23,6 +26,21 @@ COLS_EC = 'ec'
 LOG = logging.getLogger(__name__)
 
 
+def _url_read_retry(url, data=None, agent=None, max_retries=5, base_delay=1.):
+    """
+    .. versionadded:: 0.5.8
+
+    Reads an URL like :func:`mgkit.net.url_read`, but retries the request
+    when Uniprot replies with a *429* (rate limited) or *503* status code,
+    instead of returning the error page. Thin wrapper of
+    :func:`mgkit.net.utils.url_open_retry`, which holds the retry/backoff
+    policy, reading the response body.
+    """
+    return url_open_retry(url, data=data, agent=agent,
+                          max_retries=max_retries,
+                          base_delay=base_delay).text
+
+
 def get_sequences_by_ko(ko_id, taxonomy, contact=None, reviewed=True):
     """
     Gets sequences from Uniprot, restricting to the taxon id passed.
@@ -46,7 +64,7 @@ def get_sequences_by_ko(ko_id, taxonomy, contact=None, reviewed=True):
         LOG.debug("query: %s?%s", UNIPROT_GET, params)
         LOG.debug("request length %d", len(params))
 
-    fasta = url_read(UNIPROT_GET, data=params, agent=contact)
+    fasta = _url_read_retry(UNIPROT_GET, data=params, agent=contact)
 
     return fasta
 
@@ -83,28 +101,25 @@ def get_mappings(entry_ids, db_from='ID', db_to='EMBL', out_format='tab',
         'format': out_format
     }
 
-    mappings = url_read(UNIPROT_MAP, data=data, agent=contact)
+    mappings = _url_read_retry(UNIPROT_MAP, data=data, agent=contact)
 
     mappings = mappings.strip()
 
     if out_format == 'list':
         mappings = mappings.split('\n')
     elif out_format == 'tab':
-        mapping_dict = {}
-        mappings = mappings.split('\n')
-        # delete first row 'From to'
-        del mappings[0]
+        mapping_dict = collections.defaultdict(list)
+        reader = csv.reader(io.StringIO(mappings), delimiter='\t')
+        # skip the first row 'From to'
+        next(reader, None)
 
-        for mapping in mappings:
-            id_from, id_to = mapping.split('\t')
+        for id_from, id_to in reader:
             if id_to == 'null':
                 continue
-            try:
-                mapping_dict[id_from].append(id_to)
-            except KeyError:
-                mapping_dict[id_from] = [id_to]
+            mapping_dict[id_from].append(id_to)
 
-        mappings = mapping_dict
+        # callers expect a plain dict (missing keys raise KeyError)
+        mappings = dict(mapping_dict)
 
     return mappings
 
@@ -133,18 +148,19 @@ def ko_to_mapping(ko_id, query, columns, contact=None):
         'columns': columns
     }
 
-    mappings = url_read(UNIPROT_GET, data=data, agent=contact)
+    mappings = _url_read_retry(UNIPROT_GET, data=data, agent=contact)
 
     if mgkit.DEBUG:
         LOG.debug("query: %s?%s", UNIPROT_GET, data)
         LOG.debug("request length %d", len(data))
 
-    mappings = mappings.split('\n')
-    del mappings[0]
+    lines = iter(mappings.splitlines())
+    # skip the header row
+    next(lines, None)
 
     categories = set()
 
-    for map_line in mappings:
+    for map_line in lines:
 
         mappings = [mapping.strip() for mapping in map_line.split(';')]
         if not mappings:
@@ -153,10 +169,7 @@ def ko_to_mapping(ko_id, query, columns, contact=None):
         categories.update(mappings)
 
     # in case an empty line is present
-    try:
-        categories.remove('')
-    except KeyError:
-        pass
+    categories.discard('')
 
     return categories
 
@@ -165,6 +178,9 @@ def get_gene_info(gene_ids, columns, max_req=50, contact=None):
     """
     .. versionadded:: 0.1.12
 
+    .. versionchanged:: 0.5.8
+        the requests are sent concurrently, instead of one at a time
+
     Get informations about a list of genes. it uses :func:`query_uniprot` to
     send the request and format the response in a dictionary.
 
@@ -198,29 +214,38 @@ def get_gene_info(gene_ids, columns, max_req=50, contact=None):
 
     infos = {}
 
-    for index in range(0, len(gene_ids), max_req):
+    chunks = [
+        gene_ids[index:index+max_req]
+        for index in range(0, len(gene_ids), max_req)
+    ]
 
-        LOG.info(
-            "Querying uniprot ids (%d/%d)",
-            index + max_req,
-            len(gene_ids)
-        )
+    LOG.info(
+        "Querying uniprot for %d ids (%d requests)",
+        len(gene_ids),
+        len(chunks)
+    )
 
-        info_lines = query_uniprot(
-            ' OR '.join('id:{}'.format(gene_id) for gene_id in gene_ids[index:index+max_req]),
+    def request_chunk(chunk):
+        return query_uniprot(
+            ' OR '.join('id:{}'.format(gene_id) for gene_id in chunk),
             columns=['id'] + columns,
             contact=contact
         )
 
-        info_lines = info_lines.split('\n')
+    # capped so a big id list doesn't hammer Uniprot with dozens of
+    # simultaneous requests (which is what triggers the 429s)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        responses = list(executor.map(request_chunk, chunks))
 
-        del info_lines[0]
+    for response in responses:
 
-        for info_line in info_lines:
-            info_line = info_line.strip()
-            if not info_line:
+        reader = csv.reader(io.StringIO(response), delimiter='\t')
+        # skip the header row
+        next(reader, None)
+
+        for values in reader:
+            if not values:
                 continue
-            values = info_line.split('\t')
 
             gene_id = values[0]
 
@@ -237,13 +262,16 @@ def get_gene_info(gene_ids, columns, max_req=50, contact=None):
 
 
 def query_uniprot(query, columns=None, format='tab', limit=None, contact=None,
-                  baseurl=UNIPROT_GET):
+                  baseurl=UNIPROT_GET, cache=False):
     """
     .. versionadded:: 0.1.12
 
     .. versionchanged:: 0.1.13
         added *baseurl* and made *columns* a default argument
 
+    .. versionchanged:: 0.5.8
+        added *cache*, to memoise responses on disk
+
     Queries Uniprot, returning the raw response in tbe format specified. More
     informations at the `page <http://www.uniprot.org/faq/28>`_
 
@@ -257,6 +285,9 @@ def query_uniprot(query, columns=None, format='tab', limit=None, contact=None,
             Uniprot API)
         baseurl (str): base url for the REST API, can be either
             :data:`UNIPROT_GET` or :data:`UNIPROT_TAXONOMY`
+        cache (bool): if True the response is cached on disk (see
+            :func:`mgkit.net.utils.url_read_cached`) and reused by later
+            identical queries
     Returns:
         str: raw response from the query
 
@@ -287,7 +318,10 @@ def query_uniprot(query, columns=None, format='tab', limit=None, contact=None,
         LOG.debug("query: %s?%s", baseurl, data)
         LOG.debug("request length %d", len(data))
 
-    return url_read(baseurl, data, agent=contact)
+    if cache:
+        return url_read_cached(baseurl, data, agent=contact)
+
+    return _url_read_retry(baseurl, data, agent=contact)
 
 
 def parse_uniprot_response(data, simple=True):
@@ -309,16 +343,13 @@ def parse_uniprot_response(data, simple=True):
         only one column and *simple* is True, in which case the value is
         equal to the value of the only column.
     """
-    data = data.splitlines()
-
-    columns = [x.lower() for x in data[0].split('\t')[1:]]
+    reader = csv.reader(io.StringIO(data), delimiter='\t')
 
-    del data[0]
+    columns = [x.lower() for x in next(reader)[1:]]
 
     parsed_data = {}
 
-    for line in data:
-        line = line.split('\t')
+    for line in reader:
         entry_id = line[0]
 
         if (len(columns) == 1) and simple:
@@ -356,13 +387,13 @@ def get_ko_to_eggnog_mappings(ko_ids, contact=None):
         contact=contact
     )
 
-    data = data.splitlines()
-
-    del data[0]
+    lines = iter(data.splitlines())
+    # skip the header row
+    next(lines, None)
 
     parsed_data = {}
 
-    for line in data:
+    for line in lines:
         ko_ids, eggnog_ids = line.split('\t')
         ko_ids = ko_ids.split(';')
 
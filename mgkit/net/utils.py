@@ -1,7 +1,33 @@
 """
 Utility functions for the network package
 """
+import gzip
+import hashlib
+import logging
+import os
+import random
+import tempfile
+import time
+from urllib.parse import urlencode
+
 import requests
+from requests.adapters import HTTPAdapter
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'mgkit', 'net')
+"Default directory where :func:`url_read_cached` stores the responses"
+
+LOG = logging.getLogger(__name__)
+
+SESSION = requests.Session()
+"""
+.. versionadded:: 0.5.8
+
+Module-level session, so repeated requests (e.g. the chunked queries in
+:mod:`mgkit.net.uniprot`) reuse the same keep-alive connections instead of
+paying a TCP/TLS handshake each time.
+"""
+SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=32))
+SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=32))
 
 
 def url_open(url, data=None, headers=None, agent=None, get=True, stream=False):
@@ -9,6 +35,10 @@ def url_open(url, data=None, headers=None, agent=None, get=True, stream=False):
     .. versionchanged:: 0.3.4
         now uses *requests*
 
+    .. versionchanged:: 0.5.8
+        requests go through a module-level :class:`requests.Session`, reusing
+        connections between calls
+
     Arguments:
         url (str): url to request
         data (dict): parameters to pass to the request
@@ -27,9 +57,9 @@ def url_open(url, data=None, headers=None, agent=None, get=True, stream=False):
     if (agent is not None) and (headers is None):
         headers = {'user-agent': agent}
     if get:
-        request = requests.get(url, params=data, headers=headers, stream=stream)
+        request = SESSION.get(url, params=data, headers=headers, stream=stream)
     else:
-        request = requests.post(url, params=data, headers=headers, stream=stream)
+        request = SESSION.post(url, params=data, headers=headers, stream=stream)
 
     if stream:
         return request.iter_lines()
@@ -59,3 +89,110 @@ def url_read(url, data=None, agent=None, headers=None, get=True):
     """
     request = url_open(url, data=data, agent=agent, headers=headers, get=get, stream=False)
     return request.text
+
+
+def url_open_retry(url, data=None, agent=None, get=True, max_retries=5,
+                   base_delay=1.):
+    """
+    .. versionadded:: 0.5.8
+
+    Like :func:`url_open`, but retries the request when the server replies
+    with a *429* (rate limited) or *503* status code. The *Retry-After*
+    header is honoured when present, otherwise an exponential backoff with
+    jitter is used between attempts. If all retries fail, the last
+    response raises :exc:`requests.exceptions.HTTPError`.
+
+    Returns:
+        requests.Response: the first response with a non-retryable status
+    """
+    response = None
+
+    for attempt in range(max_retries):
+        response = url_open(url, data=data, agent=agent, get=get)
+
+        if response.status_code not in (429, 503):
+            return response
+
+        # no point sleeping when no attempt is left
+        if attempt == (max_retries - 1):
+            break
+
+        try:
+            delay = float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            delay = (2 ** attempt) * base_delay + random.random()
+
+        LOG.warning(
+            "Request returned status %d, retrying in %.1f seconds",
+            response.status_code,
+            delay
+        )
+
+        time.sleep(delay)
+
+    response.raise_for_status()
+
+
+def url_read_cached(url, data=None, agent=None, get=True, max_age=None,
+                    cache_dir=None):
+    """
+    .. versionadded:: 0.5.8
+
+    Wrapper of :func:`url_open_retry` that memoises the response on disk,
+    keyed by the *url* and *data* passed. Meant for requests that are
+    deterministic functions of their parameters (e.g. a taxonomy dump or a
+    Uniprot query), so repeated pipeline runs read from disk instead of
+    the network. Only *200* responses are cached (rate-limited requests
+    are retried and any other error raises
+    :exc:`requests.exceptions.HTTPError`), and the cache file is written
+    atomically, so concurrent runs cannot read a partial response.
+
+    Arguments:
+        url (str): url to request
+        data (dict or None): data to add to the request
+        agent (str or None): if supplied, the 'User-Agent' header we'll be
+            added to the request
+        get (bool): uses a GET operation if True, POST if False
+        max_age (float or None): maximum age (in seconds) of a cached
+            response; older files are re-downloaded. *None* disables the
+            check
+        cache_dir (str or None): directory for the cached responses,
+            defaults to :data:`CACHE_DIR`
+
+    Returns:
+        str: the response data, possibly from the cache
+    """
+    if cache_dir is None:
+        cache_dir = CACHE_DIR
+
+    key = url if data is None else '?'.join(
+        [url, urlencode(sorted(data.items()))]
+    )
+    cache_file = os.path.join(
+        cache_dir,
+        hashlib.sha1(key.encode('utf-8')).hexdigest() + '.gz'
+    )
+
+    if os.path.exists(cache_file):
+        age = time.time() - os.path.getmtime(cache_file)
+        if (max_age is None) or (age <= max_age):
+            with gzip.open(cache_file, 'rt') as file_handle:
+                return file_handle.read()
+
+    response = url_open_retry(url, data=data, agent=agent, get=get)
+
+    # an error page must not be served from the cache on later runs
+    if response.status_code != 200:
+        response.raise_for_status()
+        # a non-error status other than 200 (e.g. 204) is not cached
+        return response.text
+
+    os.makedirs(cache_dir, exist_ok=True)
+
+    file_desc, tmp_file = tempfile.mkstemp(suffix='.gz', dir=cache_dir)
+    os.close(file_desc)
+    with gzip.open(tmp_file, 'wt') as file_handle:
+        file_handle.write(response.text)
+    os.replace(tmp_file, cache_file)
+
+    return response.text
@@ -276,37 +276,37 @@ class GeneSNP(RatioMixIn):
             else:
                 self.coverage += other.coverage
 
-    def to_json(self):
+    def to_dict(self):
         """
-        Returns a json definition of the instance
+        .. versionadded:: 0.5.8
+
+        Returns a dictionary definition of the instance, with the SNP types
+        as plain values; used by :meth:`GeneSNP.to_json` and the msgpack
+        serialisation of SNP data
 
         Returns:
-            str: json representation of the instance
+            dict: dictionary representation of the instance
         """
-        return json.dumps(
-            {
-                'uid': self.uid,
-                'gene_id': self.gene_id,
-                'exp_syn': self.exp_syn,
-                'exp_nonsyn': self.exp_nonsyn,
-                'taxon_id': self.taxon_id,
-                'coverage': self.coverage,
-                'snps': [
-                    (pos, change, snptype.value)
-                    for pos, change, snptype in self.snps
-                ]
-            }
-        )
-
-    def from_json(self, data):
+        return {
+            'uid': self.uid,
+            'gene_id': self.gene_id,
+            'exp_syn': self.exp_syn,
+            'exp_nonsyn': self.exp_nonsyn,
+            'taxon_id': self.taxon_id,
+            'coverage': self.coverage,
+            'snps': [
+                (pos, change, snptype.value)
+                for pos, change, snptype in self.snps
+            ]
+        }
+
+    def from_dict(self, data):
         """
-        Instantiate the instance with values from a json definition
+        .. versionadded:: 0.5.8
 
-        Arguments:
-            data (str): json representation, as returned by
-                :meth:`GeneSNP.to_json`
+        Instantiate the instance with values from a dictionary, as returned
+        by :meth:`GeneSNP.to_dict`
         """
-        data = json.loads(data)
         self.uid = str(data['uid'])
         self.gene_id = str(data['gene_id'])
         self.exp_syn = data['exp_syn']
@@ -318,6 +318,25 @@ class GeneSNP(RatioMixIn):
             for pos, change, snptype in data['snps']
         ]
 
+    def to_json(self):
+        """
+        Returns a json definition of the instance
+
+        Returns:
+            str: json representation of the instance
+        """
+        return json.dumps(self.to_dict())
+
+    def from_json(self, data):
+        """
+        Instantiate the instance with values from a json definition
+
+        Arguments:
+            data (str): json representation, as returned by
+                :meth:`GeneSNP.to_json`
+        """
+        self.from_dict(json.loads(data))
+
     def _cache_values(self):
         self._syn = sum(1 for x in self.snps if x[2] is SNPType.syn)
         self._nonsyn = sum(1 for x in self.snps if x[2] is SNPType.nonsyn)
@@ -92,8 +92,44 @@ def filter_genesyn_by_coverage(gene_syn, min_cov=None):
     return gene_syn.coverage >= min_cov
 
 
+class TaxonFilterCached(object):
+    """
+    .. versionadded:: 0.5.8
+
+    Callable equivalent to a partial of :func:`filter_genesyn_by_taxon_id`
+    that memoises the outcome per taxon_id: the ancestry walk through the
+    taxonomy runs once per distinct taxon instead of once per record.
+    Instances can be pickled, so they work with the parallel path of
+    :func:`mgkit.snps.funcs.combine_sample_snps`.
+    """
+    def __init__(self, taxonomy, filter_list, exclude=False, func=None):
+        self.taxonomy = taxonomy
+        self.filter_list = filter_list
+        self.exclude = exclude
+        self.func = func
+        self._cache = {}
+
+    def __call__(self, gene_syn):
+        taxon_id = gene_syn.taxon_id
+        try:
+            return self._cache[taxon_id]
+        except KeyError:
+            result = filter_genesyn_by_taxon_id(
+                gene_syn,
+                taxonomy=self.taxonomy,
+                filter_list=self.filter_list,
+                exclude=self.exclude,
+                func=self.func
+            )
+            self._cache[taxon_id] = result
+            return result
+
+
 def get_default_filters(taxonomy, **kwargs):
     """
+    .. versionchanged:: 0.5.8
+        the taxonomy filter caches its result per taxon_id
+
     Retuns a list of filters that are used by default. it needs a valid
     taxonomy and gets the default arguments from
     :data:`mgkit.consts.DEFAULT_SNP_FILTER`.
@@ -105,10 +141,9 @@ def get_default_filters(taxonomy, **kwargs):
         filter_genesyn_by_coverage,
         min_cov=filter_opts['min_cov']
     )
-    filter_black_list = functools.partial(
-        filter_genesyn_by_taxon_id,
-        taxonomy=taxonomy,
-        filter_list=filter_opts['include_only'],
+    filter_black_list = TaxonFilterCached(
+        taxonomy,
+        filter_opts['include_only'],
         exclude=False,
         func=filter_opts['func']
     )
@@ -7,6 +7,7 @@ import itertools
 import functools
 import csv
 import copy
+import multiprocessing
 from future.utils import viewitems, viewvalues
 from .filter import pipe_filters
 
@@ -183,10 +184,80 @@ def order_ratios(ratios, aggr_func=numpy.median, reverse=False,
     return [x[1] for x in order]
 
 
+_COMBINE_OPTIONS = None
+
+
+def _init_combine_sample(filters, gene_func, taxon_func, use_uid, index_type,
+                         calc_method, haplotypes, store_uids):
+    "Stores the options used by :func:`_combine_sample_snps` in the process"
+    global _COMBINE_OPTIONS
+    _COMBINE_OPTIONS = (filters, gene_func, taxon_func, use_uid, index_type,
+                        calc_method, haplotypes, store_uids)
+
+
+def _combine_sample_snps(sample, genes_dict):
+    """
+    Filters, maps and aggregates the SNPs of one sample, returning the
+    sample name, a dictionary key->ratio and (if requested) a dictionary
+    key->set of uids. Used by :func:`combine_sample_snps`, possibly in a
+    worker process.
+    """
+    (filters, gene_func, taxon_func, use_uid, index_type, calc_method,
+     haplotypes, store_uids) = _COMBINE_OPTIONS
+
+    LOG.info('Analysing SNP from sample %s', sample)
+
+    row_dict = {}
+    uids_dict = {}
+
+    for gene_syn in pipe_filters(viewvalues(genes_dict), *filters):
+
+        iter_func = itertools.product(
+            gene_func(gene_syn.uid if use_uid else gene_syn.gene_id),
+            taxon_func(gene_syn.taxon_id)
+        )
+
+        for gene_id, taxon_id in iter_func:
+
+            if index_type == 'gene':
+                key = gene_id
+            elif index_type == 'taxon':
+                key = taxon_id
+            else:
+                key = (gene_id, taxon_id)
+
+            if store_uids:
+                try:
+                    uids_dict[key].add(gene_syn.uid)
+                except KeyError:
+                    uids_dict[key] = set([gene_syn.uid])
+
+            # we don't care about info about ids and so on, only syn/nonsyn
+            # and coverage, to use the calc_ratio method
+            try:
+                row_dict[key].add(gene_syn)
+            except KeyError:
+                # Needed with the new GeneSNP, because copies the
+                # references and the number of SNPs raises (the original
+                # data structure is modified)
+                row_dict[key] = copy.deepcopy(gene_syn)
+
+    values = dict(
+        (
+            key,
+            gene.calc_ratio(haplotypes=haplotypes)
+            if calc_method == 'calc_ratio' else getattr(gene, calc_method)()
+        )
+        for key, gene in viewitems(row_dict)
+    )
+
+    return sample, values, uids_dict
+
+
 def combine_sample_snps(snps_data, min_num, filters, index_type=None,
                         gene_func=None, taxon_func=None, use_uid=False,
                         flag_values=False, haplotypes=True, store_uids=False,
-                        partial_calc=False, partial_syn=True):
+                        partial_calc=False, partial_syn=True, num_procs=1):
     """
     .. versionchanged:: 0.2.2
         added *use_uid* argument
@@ -200,6 +271,9 @@ def combine_sample_snps(snps_data, min_num, filters, index_type=None,
     .. versionchanged:: 0.5.3
         added *partial_calc* and *partial_type*
 
+    .. versionchanged:: 0.5.8
+        added *num_procs* to process the samples in parallel
+
     Combine a dictionary sample->gene_index->GeneSyn into a
     :class:`pandas.DataFrame`. The dictionary is first filtered with the
     functions in `filters`, mapped to different taxa and genes using
@@ -235,6 +309,9 @@ def combine_sample_snps(snps_data, min_num, filters, index_type=None,
         partial_syn (bool): if both *partial_calc* and this are True, only pS
             values will be calculated. If this parameter is False, pN values
             will be calculated
+        num_procs (int): if greater than 1, the samples are processed in
+            that number of worker processes; the *filters* and mapping
+            functions must then be picklable
 
     Returns:
         DataFrame: :class:`pandas.DataFrame` with the pN/pS values for the
@@ -242,63 +319,49 @@ def combine_sample_snps(snps_data, min_num, filters, index_type=None,
         the return value is a tuple (DataFrame, dict)
 
     """
-    sample_dict = dict((sample, {}) for sample in snps_data)
-    multi_index = set()
-
     if gene_func is None:
         gene_func = functools.partial(itertools.repeat, times=1)
     if taxon_func is None:
         taxon_func = functools.partial(itertools.repeat, times=1)
 
-    if store_uids:
-        uids_dict = {}
-    
-    if flag_values:
-        calc_method = 'calc_ratio_flag'
     if partial_calc:
         if partial_syn:
             calc_method = 'calc_ps'
         else:
             calc_method = 'calc_pn'
-        
-
-    for sample, genes_dict in viewitems(snps_data):
-
-        LOG.info('Analysing SNP from sample %s', sample)
-
-        for gene_syn in pipe_filters(viewvalues(genes_dict), *filters):
-
-            iter_func = itertools.product(
-                gene_func(gene_syn.uid if use_uid else gene_syn.gene_id),
-                taxon_func(gene_syn.taxon_id)
-            )
+    elif flag_values:
+        calc_method = 'calc_ratio_flag'
+    else:
+        calc_method = 'calc_ratio'
 
-            for gene_id, taxon_id in iter_func:
+    init_args = (filters, gene_func, taxon_func, use_uid, index_type,
+                 calc_method, haplotypes, store_uids)
 
-                if index_type == 'gene':
-                    key = gene_id
-                elif index_type == 'taxon':
-                    key = taxon_id
-                else:
-                    key = (gene_id, taxon_id)
+    if num_procs > 1:
+        LOG.info("Processing samples with %d processes", num_procs)
+        with multiprocessing.Pool(num_procs, initializer=_init_combine_sample,
+                                  initargs=init_args) as pool:
+            results = pool.starmap(_combine_sample_snps, viewitems(snps_data))
+    else:
+        _init_combine_sample(*init_args)
+        results = [
+            _combine_sample_snps(sample, genes_dict)
+            for sample, genes_dict in viewitems(snps_data)
+        ]
 
-                if store_uids:
-                    try:
-                        uids_dict[key].add(gene_syn.uid)
-                    except KeyError:
-                        uids_dict[key] = set([gene_syn.uid])
+    sample_dict = {}
+    multi_index = set()
+    uids_dict = {}
 
-                # we don't care about info about ids and so on, only syn/nonsyn
-                # and coverage, to use the calc_ratio method
+    for sample, values, sample_uids in results:
+        sample_dict[sample] = values
+        multi_index.update(values)
+        if store_uids:
+            for key, uids in viewitems(sample_uids):
                 try:
-                    sample_dict[sample][key].add(gene_syn)
+                    uids_dict[key].update(uids)
                 except KeyError:
-                    # Needed with the new GeneSNP, because copies the
-                    # references and the number of SNPs raises (the original
-                    # data structure is modified)
-                    sample_dict[sample][key] = copy.deepcopy(gene_syn)
-
-                multi_index.add(key)
+                    uids_dict[key] = uids
 
     if index_type is None:
         multi_index = pandas.MultiIndex.from_tuples(
@@ -312,16 +375,6 @@ def combine_sample_snps(snps_data, min_num, filters, index_type=None,
     # matter in the calculation anymore, using haplotypes=True, the special
     # case where syn=nonsyn=0 will result in a 0 as pN/pS for a GeneSyn
     # instance
-    sample_dict = dict(
-        (
-            sample,
-            dict(
-                (key, getattr(gene, calc_method)() if (flag_values or partial_calc) else gene.calc_ratio(haplotypes=haplotypes))
-                for key, gene in viewitems(row_dict)
-            )
-        )
-        for sample, row_dict in viewitems(sample_dict)
-    )
     dataframe = pandas.DataFrame(sample_dict, index=multi_index,
                                  columns=sorted(sample_dict.keys()))
 
@@ -906,6 +906,24 @@ class Taxonomy(object):
             for taxon in self
         )
 
+    def get_names(self, taxon_ids):
+        """
+        .. versionadded:: 0.5.8
+
+        Returns the scientific names for an iterable of taxon_ids, in the
+        same order, in a single call.
+
+        Arguments:
+            taxon_ids (iterable): taxon IDs to look up
+
+        Returns:
+            list: the scientific name of each taxon_id passed
+        """
+        return [
+            self[taxon_id].s_name
+            for taxon_id in taxon_ids
+        ]
+
     def get_lineage(self, taxon_id, names=False, only_ranked=True, with_last=True, **kwd):
         """
         .. versionadded:: 0.3.1
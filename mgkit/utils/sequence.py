@@ -84,8 +84,45 @@ def reverse_complement(seq, tbl=REV_COMP_ASCII):
     return seq[::-1].translate(tbl)
 
 
+_BASE_CODES = numpy.full(256, 4, dtype=numpy.uint8)
+"Maps each base (its ASCII code) to a 0-4 code, any non-ACGT base is 4"
+for _idx, _base in enumerate('ACGT'):
+    _BASE_CODES[ord(_base)] = _idx
+
+_CODON_LUTS = {}
+"Cache of codon lookup tables built by :func:`_make_codon_lut`"
+
+
+def _make_codon_lut(tbl):
+    """
+    .. versionadded:: 0.5.8
+
+    Builds (and caches) a 125-entry lookup table for *tbl*, one cell per
+    codon in base-5 (ACGT plus *other*), with codons not in *tbl* mapped
+    to 'X'
+    """
+    try:
+        return _CODON_LUTS[id(tbl)][1]
+    except KeyError:
+        pass
+
+    lut = numpy.full(125, b'X', dtype='S1')
+
+    for codon, amino_acid in viewitems(tbl):
+        codes = [_BASE_CODES[ord(base)] for base in codon]
+        lut[codes[0] * 25 + codes[1] * 5 + codes[2]] = amino_acid.encode('ascii')
+
+    # the table is kept referenced so its id() stays valid for the cache
+    _CODON_LUTS[id(tbl)] = (tbl, lut)
+
+    return lut
+
+
 def translate_sequence(sequence, start=0, tbl=None, reverse=False):
     """
+    .. versionchanged:: 0.5.8
+        the translation is vectorised with a numpy codon lookup table
+
     Translate a nucleotide sequence in an amino acid one.
 
     :param str sequence: sequence to translate, it's expected to be all caps
@@ -101,17 +138,21 @@ def translate_sequence(sequence, start=0, tbl=None, reverse=False):
     if tbl is None:
         tbl = UNIVERSAL
 
-    trs = []
-
-    for idx in range(start, len(sequence), 3):
-        codon = sequence[idx:idx+3]
-        if len(codon) < 3:
-            break
-        try:
-            trs.append(tbl[codon])
-        except KeyError:
-            trs.append('X')
-    return ''.join(trs)
+    lut = _make_codon_lut(tbl)
+
+    codes = _BASE_CODES[
+        numpy.frombuffer(sequence.encode('ascii'), dtype=numpy.uint8)
+    ]
+
+    end = start + ((len(codes) - start) // 3) * 3
+    if end <= start:
+        return ''
+
+    codons = codes[start:end].reshape(-1, 3)
+    # max index is 124, so the uint8 arithmetic cannot overflow
+    indices = codons[:, 0] * 25 + codons[:, 1] * 5 + codons[:, 2]
+
+    return lut[indices].tobytes().decode('ascii')
 
 
 def put_gaps_in_nuc_seq(nuc_seq, aa_seq, trim=True):
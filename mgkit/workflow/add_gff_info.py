@@ -373,9 +373,8 @@ def kegg_command(verbose, email, description, pathways, kegg_id, input_file,
     ko_cache = {}
 
     for annotation in gff.parse_gff(input_file, gff_type=gff.from_gff):
-        try:
-            ko_id = annotation.attr[kegg_id]
-        except KeyError:
+        ko_id = annotation.attr.get(kegg_id)
+        if ko_id is None:
             annotation.to_file(output_file)
             continue
         # if more than one KO is defined
@@ -386,9 +385,8 @@ def kegg_command(verbose, email, description, pathways, kegg_id, input_file,
             )
             annotation.to_file(output_file)
             continue
-        try:
-            ko_info = ko_cache[ko_id]
-        except KeyError:
+        ko_info = ko_cache.get(ko_id)
+        if ko_info is None:
             ko_info = {}
             if pathways:
                 ko_info['pathway'] = kegg_client.link_ids('path', ko_id)
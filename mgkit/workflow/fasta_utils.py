@@ -54,10 +54,14 @@ Changes
 .. versionchanged:: 0.5.7
     added `filter` and `info` commands for simple fasta file filtering and info
 
+.. versionchanged:: 0.5.8
+    added option `-p` to the *translate* command, to use multiple processors
+
 """
 
 from builtins import range
 import logging
+import multiprocessing
 from uuid import uuid4
 import click
 import hashlib
@@ -118,10 +122,24 @@ def load_trans_table(table_name):
 
 def translate_seq(name, seq, trans_table):
     "Tranlates sequence into the 6 frames"
-    header = "{0}-{1}{2}"
     for start in range(3):
-        yield header.format(name, 'f', start), translate_sequence(seq, start, trans_table, False)
-        yield header.format(name, 'r', start), translate_sequence(seq, start, trans_table, True)
+        yield f"{name}-f{start}", translate_sequence(seq, start, trans_table, False)
+        yield f"{name}-r{start}", translate_sequence(seq, start, trans_table, True)
+
+
+_WORKER_TRANS_TABLE = None
+
+
+def _init_translate_worker(trans_table):
+    "Stores the translation table in the worker process"
+    global _WORKER_TRANS_TABLE
+    _WORKER_TRANS_TABLE = trans_table
+
+
+def _translate_seq_worker(record):
+    "Translates one sequence (6 frames) in a worker process"
+    name, seq = record
+    return list(translate_seq(name, seq, _WORKER_TRANS_TABLE))
 
 
 @main.command('translate', help="""Translate FASTA file [fasta-file] in all 6
@@ -134,11 +152,14 @@ def translate_seq(name, seq, trans_table):
               help='Only translate the sequence, instead of all 6 frames')
 @click.option('-w', '--no-wrap', default=False, is_flag=True, show_default=True,
               help='Make a sequence use only 1 line (2 including header)')
+@click.option('-p', '--processors', default=1, type=click.IntRange(min=1),
+              show_default=True,
+              help='Number of processors to use for the translation')
 @click.option('--progress', default=False, is_flag=True,
               help="Shows Progress Bar")
 @click.argument('fasta-file', type=click.File('rb'), default='-')
 @click.argument('output-file', type=click.File('wb'), default='-')
-def translate_command(verbose, trans_table, one_seq, no_wrap, progress, fasta_file, output_file):
+def translate_command(verbose, trans_table, one_seq, no_wrap, processors, progress, fasta_file, output_file):
     mgkit.logger.config_log(level=logging.DEBUG if verbose else logging.INFO)
     if one_seq:
         LOG.info("Assuming the sequences are in the correct frame")
@@ -159,6 +180,17 @@ def translate_command(verbose, trans_table, one_seq, no_wrap, progress, fasta_fi
     else:
         wrap = 60
 
+    if (processors > 1) and (not one_seq):
+        # one persistent pool translates while this process writes; the
+        # translation table is sent to each worker once, at startup
+        with multiprocessing.Pool(processors, initializer=_init_translate_worker,
+                                  initargs=(trans_table,)) as pool:
+            for translations in pool.imap(_translate_seq_worker, iterator,
+                                          chunksize=256):
+                for new_header, new_seq in translations:
+                    fasta.write_fasta_sequence(output_file, new_header, new_seq, wrap=wrap)
+        return
+
     for name, seq in iterator:
         if one_seq:
             new_seq = translate_sequence(seq, 0, trans_table, False)
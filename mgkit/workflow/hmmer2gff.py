@@ -38,9 +38,12 @@ Changes
     added *--no-frame* option for non mgkit-translated proteins, sequence
     headers are handled the same way as HMMER (truncated at the first space)
 
+.. versionchanged:: 0.5.8
+    lines are split once and the evalue filter is applied before building
+    the annotation
+
 """
 
-import sys
 import logging
 import argparse
 from mgkit import logger
@@ -62,7 +65,7 @@ def set_parser():
     group = parser.add_argument_group('File options')
     group.add_argument(
         'aa_file',
-        type=argparse.FileType('r'),
+        type=argparse.FileType('rb'),
         help="Fasta file containing contigs translated to aa (used by HMMER)"
     )
     group.add_argument(
@@ -75,7 +78,7 @@ def set_parser():
         '-o',
         '--output-file',
         nargs='?',
-        type=argparse.FileType('w'), default=sys.stdout
+        type=argparse.FileType('wb'), default='-'
     )
 
     group = parser.add_argument_group('Filters')
@@ -134,16 +137,23 @@ def set_parser():
 
 def get_aa_data(f_handle):
     """
+    .. versionchanged:: 0.5.8
+        the file is memory-mapped and indexed instead of loaded in a dict
+
     Load aminoacid seuqnces used by HMMER.
     """
-    # LOG.info('Loading aa data from file %s', f_handle.name)
+    # a compressed file cannot be memory-mapped, so it falls back to
+    # loading all the sequences in a dictionary
+    if f_handle.read(2) == b'\x1f\x8b':
+        f_handle.seek(0)
+        return dict(
+            (name.split(' ')[0], seq)
+            for name, seq in fasta.load_fasta(f_handle)
+        )
 
-    aa_seqs = dict(
-        (name.split(' ')[0], seq)
-        for name, seq in fasta.load_fasta(f_handle)
-    )
+    f_handle.seek(0)
 
-    return aa_seqs
+    return fasta.MmapFasta(f_handle, rename=True)
 
 
 def parse_domain_table_contigs(options):
@@ -152,6 +162,16 @@ def parse_domain_table_contigs(options):
     """
     aa_seqs = get_aa_data(options.aa_file)
 
+    # lengths are looked up for every hit on a reverse frame, so they are
+    # precomputed instead of materialising the sequences
+    if isinstance(aa_seqs, fasta.MmapFasta):
+        aa_lens = aa_seqs.lengths()
+    else:
+        aa_lens = dict(
+            (name, len(seq))
+            for name, seq in aa_seqs.items()
+        )
+
     LOG.info('Parsing HMMER data from file %s', options.hmmer_file.name)
     LOG.info('Writing GFF data to file %s', options.output_file.name)
 
@@ -159,23 +179,43 @@ def parse_domain_table_contigs(options):
     count_tot = 0
     count_skp = 0
 
+    # annotations are buffered and written in batches, to avoid a write
+    # call per line
+    batch = []
+    batch_append = batch.append
+
+    # threshold counter instead of a modulo per line
+    next_log = 0
+
     for idx, line in enumerate(options.hmmer_file):
 
         if line.startswith('#'):
             continue
-        if idx % 10000 == 0:
+        if idx >= next_log:
             LOG.info("Line number: %d", idx)
+            next_log += 10000
 
         count_tot += 1
 
+        # the line is split once here; the evalue filter is applied before
+        # the (costly) annotation is built
+        fields = line.split()
+
+        # if disable_evalue is True, skips filter
+        if not options.disable_evalue:
+            if float(fields[6]) > options.discard:
+                count_dsc += 1
+                continue
+
         try:
             annotation = gff.from_hmmer(
-                line,
+                fields,
                 aa_seqs,
                 feat_type=options.feature_type,
                 db=options.database,
                 custom_profiles=options.no_custom_profiles,
                 noframe=options.no_frame,
+                aa_lens=aa_lens,
             )
         except ZeroDivisionError:
             LOG.error(
@@ -185,13 +225,13 @@ def parse_domain_table_contigs(options):
             count_skp += 1
             continue
 
-        # if disable_evalue is True, skips filter
-        if not options.disable_evalue:
-            if annotation.score > options.discard:
-                count_dsc += 1
-                continue
+        batch_append(annotation.to_gff().encode('ascii'))
+        if len(batch) >= 4096:
+            options.output_file.writelines(batch)
+            del batch[:]
 
-        annotation.to_file(options.output_file)
+    if batch:
+        options.output_file.writelines(batch)
 
     LOG.info(
         "Read %d lines, discarded %d, skipped %d",
@@ -75,6 +75,10 @@ pN/pS for each line in the GFF file.
 Changes
 *******
 
+.. versionchanged:: 0.5.8
+    the *vcf* and *vcf_alt* commands read the VCF files with pysam
+    (htslib) instead of PyVCF
+
 .. versionchanged:: 0.5.7
     added *vcf* command to parse VCF files and generate data for the script
 
@@ -91,13 +95,23 @@ Changes
 """
 
 
+import collections
+import hashlib
 import logging
+import multiprocessing
+import os
+import sys
+import tempfile
 from typing import OrderedDict
 import itertools
 import click
+import numpy
+import pandas
+import pyarrow
+from pyarrow import csv as pacsv
 import pickle
 import functools
-import vcf
+import pysam
 from tqdm import tqdm
 from mgkit import taxon
 from mgkit.snps import conv_func
@@ -105,16 +119,188 @@ import mgkit.snps.mapper
 import mgkit.snps.funcs
 import mgkit.snps.filter as snp_filter
 from ..snps.classes import GeneSNP, SNPType
-from ..io import gff, fasta
+from ..io import gff, fasta, open_file
 from . import utils
-from ..utils import dictionary
 from .. import logger
 
 LOG = logging.getLogger(__name__)
 
-# changing the value for the script to remove subclass as rank
-taxon.TAXON_RANKS = tuple(rank for rank in taxon.TAXON_RANKS
-                          if not rank.startswith('sub'))
+# the script does not expose the sub* ranks; kept as a module-level
+# tuple instead of overwriting mgkit.taxon.TAXON_RANKS, which would
+# change the ranks for every other user of the taxonomy module in the
+# same process
+TAXON_RANKS = tuple(rank for rank in taxon.TAXON_RANKS
+                    if not rank.startswith('sub'))
+
+
+TAXONOMY_CACHE_DIR = os.path.join(
+    os.path.expanduser('~'), '.cache', 'mgkit', 'taxonomy'
+)
+"Directory where the post-processed taxonomy files are cached"
+
+
+def load_taxonomy_cached(file_source):
+    """
+    .. versionadded:: 0.5.8
+
+    Loads the taxonomy like :class:`mgkit.taxon.Taxonomy`, but keeps a
+    plain-pickle copy under :data:`TAXONOMY_CACHE_DIR`, keyed by the file's
+    path, size and modification time. Compressed or msgpack taxonomy files
+    are only parsed the first time they are used; later runs load the
+    cached pickle directly. *file_source* can be a file name or a handle.
+    """
+    if isinstance(file_source, str):
+        name = file_source
+    else:
+        name = getattr(file_source, 'name', None)
+
+    if (name is None) or (not os.path.exists(name)):
+        return taxon.Taxonomy(file_source)
+
+    stat = os.stat(name)
+    key = hashlib.sha1(
+        "{}:{}:{}".format(
+            os.path.abspath(name), stat.st_mtime, stat.st_size
+        ).encode('utf-8')
+    ).hexdigest()
+    cache_file = os.path.join(TAXONOMY_CACHE_DIR, key + '.pickle')
+
+    if os.path.exists(cache_file):
+        return taxon.Taxonomy(cache_file)
+
+    taxonomy = taxon.Taxonomy(file_source)
+
+    os.makedirs(TAXONOMY_CACHE_DIR, exist_ok=True)
+
+    # written through a temp file so a concurrent run (parameter sweeps
+    # are the common case) cannot read a partially written pickle
+    file_desc, tmp_file = tempfile.mkstemp(
+        suffix='.pickle', dir=TAXONOMY_CACHE_DIR
+    )
+    os.close(file_desc)
+    taxonomy.save_data(tmp_file)
+    os.replace(tmp_file, cache_file)
+
+    return taxonomy
+
+
+def write_pnps_csv(pnps, file_handle):
+    """
+    .. versionadded:: 0.5.8
+
+    Writes the pN/pS dataframe as CSV using the pyarrow writer, which
+    formats the cells outside the GIL, instead of pandas.to_csv. The index
+    levels are written as the leading columns, like pandas would.
+    """
+    table = pyarrow.Table.from_pandas(
+        pnps.reset_index(), preserve_index=False
+    )
+    pacsv.write_csv(table, getattr(file_handle, 'buffer', file_handle))
+
+
+def write_pnps_table(pnps, file_handle, out_format, unstack=False):
+    """
+    .. versionadded:: 0.5.8
+
+    Writes the pN/pS dataframe in the requested format (csv, parquet or
+    feather), so consumers that read the table back with pandas can skip
+    the float-to-text round trip entirely.
+    """
+    if (out_format != 'csv') and unstack:
+        utils.exit_script(
+            "Only the `csv` format supports the unstacked output", 3
+        )
+
+    if out_format == 'parquet':
+        pnps.to_parquet(
+            getattr(file_handle, 'buffer', file_handle), compression='zstd'
+        )
+    elif out_format == 'feather':
+        pnps.reset_index().to_feather(
+            getattr(file_handle, 'buffer', file_handle)
+        )
+    else:
+        if unstack:
+            # the unstacked frame has a column MultiIndex, which the
+            # arrow writer does not support
+            pnps.to_csv(getattr(file_handle, 'buffer', file_handle))
+        else:
+            write_pnps_csv(pnps, file_handle)
+
+
+def log_selected_taxa(taxonomy, taxon_ids):
+    """
+    .. versionadded:: 0.5.8
+
+    Logs the taxa whose subtrees are included, skipping the name lookups
+    entirely when INFO messages are not emitted.
+    """
+    if not LOG.isEnabledFor(logging.INFO):
+        return
+    LOG.info('Only taxa below %s will be included',
+             ', '.join(taxonomy.get_names(taxon_ids)))
+
+
+def load_snp_data(file_name):
+    """
+    .. versionadded:: 0.5.8
+
+    Loads SNP data written by :func:`save_data`. The format is picked from
+    the file name, like :class:`mgkit.taxon.Taxonomy` does: a name
+    containing *.msgpack* is read with msgpack (rebuilding the
+    :class:`mgkit.snps.classes.GeneSNP` instances), anything else is
+    unpickled.
+    """
+    LOG.info("Loading SNP data from file %s", file_name)
+
+    if '.msgpack' in file_name:
+        import msgpack
+
+        with open_file(file_name, 'rb') as file_handle:
+            packed = msgpack.unpack(file_handle, raw=False)
+
+        snp_data = {}
+        for sample, genes in packed.items():
+            sample_data = {}
+            for uid, gene_dict in genes.items():
+                gene = GeneSNP()
+                gene.from_dict(gene_dict)
+                sample_data[uid] = gene
+            snp_data[sample] = sample_data
+    else:
+        with open_file(file_name, 'rb') as file_handle:
+            snp_data = pickle.load(file_handle)
+
+    # one sort at load time groups each sample's records by taxon and
+    # gene, so the downstream filter/mapping passes hit the same taxonomy
+    # entries in runs instead of bouncing between taxa
+    return {
+        sample: dict(
+            sorted(
+                genes.items(),
+                key=lambda item: (item[1].taxon_id, item[1].gene_id)
+            )
+        )
+        for sample, genes in snp_data.items()
+    }
+
+
+@functools.lru_cache(maxsize=32)
+def get_default_filters_cached(taxonomy, min_cov, include_only):
+    """
+    .. versionadded:: 0.5.8
+
+    Memoised wrapper of :func:`mgkit.snps.filter.get_default_filters`, so
+    programmatic drivers that invoke the commands repeatedly (parameter
+    sweeps and the like) reuse the same filter partials. The taxonomy is
+    keyed by identity and the result is a tuple, to avoid sharing a
+    mutable list between calls.
+    """
+    return tuple(
+        snp_filter.get_default_filters(
+            taxonomy, min_cov=min_cov, include_only=include_only
+        )
+    )
 
 
 def get_lineage(taxonomy, taxon_id):
@@ -125,6 +311,27 @@ def get_lineage(taxonomy, taxon_id):
                                        sep=';')
 
 
+def rename_to_lineage(pnps, taxonomy):
+    """
+    .. versionadded:: 0.5.8
+
+    Renames the taxon level of the *pnps* index to lineage strings. The
+    same taxon_id appears in many rows (every gene it pairs with), so the
+    lineage is resolved once per distinct id instead of once per row.
+    """
+    lineage_map = {}
+
+    def lookup(taxon_id):
+        try:
+            return lineage_map[taxon_id]
+        except KeyError:
+            lineage = get_lineage(taxonomy, taxon_id)
+            lineage_map[taxon_id] = lineage
+            return lineage
+
+    pnps.rename(lookup, inplace=True)
+
+
 @click.group()
 @click.version_option()
 @utils.cite_option
@@ -133,48 +340,75 @@ def main():
     pass
 
 
+def common_calc_options(f):
+    """
+    .. versionadded:: 0.5.8
+
+    Applies the click options shared by the *rank* and *full* commands, so
+    each Parameter is declared (and its help text allocated) once.
+    """
+    options = [
+        click.option('-v', '--verbose', is_flag=True),
+        click.option('-t', '--taxonomy', help="Taxonomy file", required=True,
+                     type=click.Path(exists=True, dir_okay=False,
+                                     readable=True)),
+        click.option('-s', '--snp-data',
+                     help="SNP data, output of `snp_parser`", required=True,
+                     type=click.Path(exists=True, dir_okay=False,
+                                     readable=True)),
+        click.option('-m', '--min-num', default=2, type=click.IntRange(min=2),
+                     help='Minimum number of samples with a pN/pS to accept',
+                     show_default=True),
+        click.option('-c', '--min-cov', default=4, type=click.IntRange(min=1),
+                     help='Minimum coverage for SNPs to be accepted',
+                     show_default=True),
+        click.option('-l', '--lineage', is_flag=True, show_default=True,
+                     help='Use lineage string instead of taxon_id'),
+        click.option('-ps', '--only-ps', is_flag=True, show_default=True,
+                     help='Only calculate pS values'),
+        click.option('-pn', '--only-pn', is_flag=True, show_default=True,
+                     help='Only calculate pN values'),
+        click.option('-F', '--out-format', default='csv', show_default=True,
+                     type=click.Choice(['csv', 'parquet', 'feather']),
+                     help='Format of the output table'),
+        click.option('-j', '--num-procs', default=1,
+                     type=click.IntRange(min=1), show_default=True,
+                     help='Number of processes used to analyse the samples'),
+    ]
+
+    for option in reversed(options):
+        f = option(f)
+
+    return f
+
+
 @main.command('rank', help="""Calculates pN/pS for a taxonomic rank""")
-@click.option('-v', '--verbose', is_flag=True)
-@click.option('-t', '--taxonomy', type=click.File('rb', lazy=False),
-              help="Taxonomy file", required=True)
-@click.option('-s', '--snp-data', type=click.File('rb', lazy=False),
-              help="SNP data, output of `snp_parser`", required=True)
+@common_calc_options
 @click.option('-r', '--rank', default='order', help='Taxonomic rank',
-              type=click.Choice(taxon.TAXON_RANKS + ('None',),
+              type=click.Choice(TAXON_RANKS + ('None',),
                                 case_sensitive=False), show_default=True)
-@click.option('-m', '--min-num', default=2, type=click.IntRange(min=2),
-              help='Minimum number of samples with a pN/pS to accept',
-              show_default=True)
-@click.option('-c', '--min-cov', default=4, type=click.IntRange(min=1),
-              help='Minimum coverage for SNPs to be accepted',
-              show_default=True)
 @click.option('-i', '--taxon_ids', type=click.INT, multiple=True,
               help='Taxon IDs to include', default=(2,), show_default=True)
 @click.option('-u', '--unstack', is_flag=True, show_default=True,
               help='Samples are not in columns but as an array')
-@click.option('-l', '--lineage', is_flag=True, show_default=True,
-              help='Use lineage string instead of taxon_id')
-@click.option('-ps', '--only-ps', is_flag=True, show_default=True,
-              help='Only calculate pS values')
-@click.option('-pn', '--only-pn', is_flag=True, show_default=True,
-              help='Only calculate pN values')
-@click.argument('txt_file', type=click.File('w', lazy=False), default='-')
+@click.argument('txt_file', type=click.File('wb', lazy=False), default='-')
 def gen_rank(verbose, taxonomy, snp_data, rank, min_num, min_cov,
-             taxon_ids, unstack, lineage, only_ps, only_pn, txt_file):
+             taxon_ids, unstack, lineage, only_ps, only_pn, out_format,
+             num_procs, txt_file):
 
     logger.config_log(level=logging.DEBUG if verbose else logging.INFO)
 
-    taxonomy = taxon.Taxonomy(taxonomy)
+    taxonomy = load_taxonomy_cached(taxonomy)
 
-    LOG.info('Only taxa below %s will be included', ', '.join(taxonomy[taxon_id].s_name for taxon_id in taxon_ids))
+    log_selected_taxa(taxonomy, taxon_ids)
     LOG.info('Rank "%s" and above will be included', rank)
 
-    snp_data = pickle.load(snp_data)
+    snp_data = load_snp_data(snp_data)
 
-    filters = snp_filter.get_default_filters(taxonomy, min_cov=min_cov,
-                                             include_only=taxon_ids)
+    filters = get_default_filters_cached(taxonomy, min_cov,
+                                         tuple(taxon_ids))
 
-    if rank not in taxon.TAXON_RANKS:
+    if rank not in TAXON_RANKS:
         rank = None
     
     if rank is None:
@@ -196,104 +430,136 @@ def gen_rank(verbose, taxonomy, snp_data, rank, min_num, min_cov,
 
     pnps = mgkit.snps.funcs.combine_sample_snps(snp_data, min_num, filters, index_type='taxon',
                                                 taxon_func=taxon_func, partial_calc=partial_calc,
-                                                partial_syn=partial_syn)
+                                                partial_syn=partial_syn, num_procs=num_procs)
 
     if lineage:
-        pnps.rename(lambda x: get_lineage(taxonomy, x), inplace=True)
+        rename_to_lineage(pnps, taxonomy)
 
     pnps.index.names = ['taxon']
 
     if unstack:
         pnps = pnps.unstack()
 
-    pnps.to_csv(txt_file)
+    write_pnps_table(pnps, txt_file, out_format, unstack=unstack)
 
 
 def read_gene_map_default(file_handle, separator):
 
+    try:
+        dataframe = pandas.read_csv(file_handle, sep=separator, header=None,
+                                    engine='c', dtype=str)
+    except pandas.errors.EmptyDataError:
+        return {}
+
     gene_map = {}
 
-    for line in file_handle:
-        fields = line.rstrip().split(separator)
-        gene_map[fields[0]] = set(fields[1:])
+    # ids repeat a lot between rows (KO, EC, etc.), so the strings are
+    # interned and the values frozen to cut the memory of large maps
+    for row in dataframe.itertuples(index=False):
+        gene_map[sys.intern(row[0])] = frozenset(
+            sys.intern(value) for value in row[1:] if not pandas.isna(value)
+        )
 
     return gene_map
 
 
 def read_gene_map_two_columns(file_handle, separator):
 
-    gene_map = {}
-
-    for line in file_handle:
-        key, value = line.rstrip().split(separator)
-        try:
-            gene_map[key].add(value)
-        except KeyError:
-            gene_map[key] = set([value])
-
-    return gene_map
+    # the two-columns format is a regular table, so it can go through the
+    # arrow CSV reader, which tokenises blocks of the file in parallel;
+    # the default format has a variable number of columns, which arrow
+    # cannot represent, and stays on pandas
+    try:
+        table = pacsv.read_csv(
+            file_handle,
+            read_options=pacsv.ReadOptions(
+                autogenerate_column_names=True, block_size=1 << 24
+            ),
+            parse_options=pacsv.ParseOptions(delimiter=separator)
+        )
+    except pyarrow.ArrowInvalid as error:
+        # an empty file is a valid (empty) map; any other parse error
+        # (e.g. rows without exactly two columns) must propagate, or a
+        # malformed map would silently drop every SNP downstream
+        if 'Empty CSV file' in str(error):
+            return {}
+        raise
+
+    dataframe = table.rename_columns(['key', 'value']).to_pandas()
+
+    return {
+        sys.intern(key): frozenset(sys.intern(value) for value in values)
+        for key, values in dataframe.groupby('key', sort=False)['value']
+    }
 
 
 @main.command('full', help="""Calculates pN/pS""")
-@click.option('-v', '--verbose', is_flag=True)
-@click.option('-t', '--taxonomy', type=click.File('rb', lazy=False),
-              help="Taxonomy file", required=True)
-@click.option('-s', '--snp-data', type=click.File('rb', lazy=False),
-              help="SNP data, output of `snp_parser`", required=True)
+@common_calc_options
 @click.option('-r', '--rank', default=None, help='Taxonomic rank',
-              type=click.Choice(taxon.TAXON_RANKS + ('None',),
+              type=click.Choice(TAXON_RANKS + ('None',),
                                 case_sensitive=False), show_default=True)
-@click.option('-m', '--min-num', default=2, type=click.IntRange(min=2),
-              help='Minimum number of samples with a pN/pS to accept',
-              show_default=True)
-@click.option('-c', '--min-cov', default=4, type=click.IntRange(min=1),
-              help='Minimum coverage for SNPs to be accepted',
-              show_default=True)
 @click.option('-i', '--taxon-ids', type=click.INT, multiple=True,
               help='Taxon IDs to include', default=None, show_default=True)
 @click.option('-u', '--use-uid', is_flag=True, show_default=True,
               help='Use uids from the GFF file instead of gene_id as genes')
-@click.option('-g', '--gene-map', type=click.File(mode='r', lazy=False),
-              help='Dictionary to map *gene_id* to another ID', default=None)
+@click.option('-g', '--gene-map', default=None,
+              type=click.Path(exists=True, dir_okay=False, readable=True),
+              help='Dictionary to map *gene_id* to another ID')
 @click.option('-2', '--two-columns', is_flag=True,
               help='gene-map is a two columns table with repeated keys')
 @click.option('-p', '--separator', default='\t', show_default=True,
               help='column separator for gene-map file')
-@click.option('-l', '--lineage', is_flag=True, show_default=True,
-              help='Use lineage string instead of taxon_id')
 @click.option('-e', '--parquet', is_flag=True, show_default=True, default=False,
-              help='Output a Parquet file instead of CSV')
-@click.option('-ps', '--only-ps', is_flag=True, show_default=True,
-              help='Only calculate pS values')
-@click.option('-pn', '--only-pn', is_flag=True, show_default=True,
-              help='Only calculate pN values')
+              help='Output a Parquet file instead of CSV (same as `-F parquet`)')
 @click.argument('output_file', type=click.Path(writable=True), required=True)
 def gen_full(verbose, taxonomy, snp_data, rank, min_num, min_cov,
              taxon_ids, use_uid, gene_map, two_columns, separator, lineage,
-             parquet, only_ps, only_pn, output_file):
+             parquet, out_format, only_ps, only_pn, num_procs, output_file):
 
     logger.config_log(level=logging.DEBUG if verbose else logging.INFO)
 
+    gene_map_keys = None
+
     if gene_map is not None:
         LOG.info('Reading gene-map')
         if two_columns:
             gene_map = read_gene_map_two_columns(gene_map, separator)
         else:
             gene_map = read_gene_map_default(gene_map, separator)
-        
+
+        # genes not in the map produce no output, so their records can be
+        # dropped before the (heavier) combine pass
+        gene_map_keys = frozenset(gene_map)
+
         gene_map = functools.partial(
             mgkit.snps.mapper.map_gene_id,
             gene_map=gene_map
         )
 
-    taxonomy = taxon.Taxonomy(taxonomy)
+    taxonomy = load_taxonomy_cached(taxonomy)
 
     if rank is not None:
         LOG.info('Rank "%s" and above will be included', rank)
 
-    snp_data = pickle.load(snp_data)
+    snp_data = load_snp_data(snp_data)
+
+    if gene_map_keys is not None:
+        count_tot = sum(len(records) for records in snp_data.values())
+        snp_data = {
+            sample: {
+                uid: record
+                for uid, record in records.items()
+                if (record.uid if use_uid else record.gene_id) in gene_map_keys
+            }
+            for sample, records in snp_data.items()
+        }
+        LOG.info(
+            'Kept %d/%d SNP records present in the gene-map',
+            sum(len(records) for records in snp_data.values()),
+            count_tot
+        )
 
-    if rank not in taxon.TAXON_RANKS:
+    if rank not in TAXON_RANKS:
         rank = None
     
     if rank is None:
@@ -313,13 +579,11 @@ def gen_full(verbose, taxonomy, snp_data, rank, min_num, min_cov,
     ]
 
     if taxon_ids:
-        LOG.info('Only taxa below %s will be included', ', '.join(
-            taxonomy[taxon_id].s_name for taxon_id in taxon_ids))
+        log_selected_taxa(taxonomy, taxon_ids)
         filters.append(
-            functools.partial(
-                snp_filter.filter_genesyn_by_taxon_id,
-                taxonomy=taxonomy,
-                filter_list=taxon_ids,
+            snp_filter.TaxonFilterCached(
+                taxonomy,
+                taxon_ids,
                 exclude=False,
                 func=taxon.is_ancestor
             )
@@ -335,17 +599,95 @@ def gen_full(verbose, taxonomy, snp_data, rank, min_num, min_cov,
 
     pnps = mgkit.snps.funcs.combine_sample_snps(snp_data, min_num, filters, gene_func=gene_map,
                                                 taxon_func=taxon_func, use_uid=use_uid,
-                                                partial_calc=partial_calc, partial_syn=partial_syn)
+                                                partial_calc=partial_calc, partial_syn=partial_syn,
+                                                num_procs=num_procs)
 
     if lineage:
-        pnps.rename(lambda x:  get_lineage(taxonomy, x), inplace=True)
+        rename_to_lineage(pnps, taxonomy)
 
     pnps.index.names = ['gene', 'taxon']
 
     if parquet:
-        pnps.to_parquet(output_file)
+        out_format = 'parquet'
+
+    write_pnps_table(pnps, output_file, out_format)
+
+
+class CachedFasta(object):
+    """
+    .. versionadded:: 0.5.8
+
+    Dict-like, lazy access to the sequences of a :class:`mgkit.io.fasta.
+    MmapFasta`, keeping only the last few materialised: VCF files and
+    annotations are processed contig by contig, so one sequence at a time
+    is hot while the reference as a whole never needs to be in memory.
+    """
+    def __init__(self, fasta_index, maxsize=4):
+        self._index = fasta_index
+        self._cache = collections.OrderedDict()
+        self._maxsize = maxsize
+
+    def __contains__(self, seq_id):
+        return seq_id in self._index
+
+    def __getitem__(self, seq_id):
+        try:
+            self._cache.move_to_end(seq_id)
+            return self._cache[seq_id]
+        except KeyError:
+            pass
+
+        seq = self._index[seq_id]
+        self._cache[seq_id] = seq
+
+        if len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+        return seq
+
+
+def load_reference_seqs(fasta_file, seq_ids=None):
+    """
+    .. versionadded:: 0.5.8
+
+    Returns dict-like access to the reference sequences: the file is
+    memory-mapped and sequences materialised on demand (gzip input, which
+    cannot be memory-mapped, falls back to loading the selected sequences
+    in a dictionary).
+    """
+    if fasta_file.read(2) == b'\x1f\x8b':
+        fasta_file.seek(0)
+        return {
+            seq_id: seq
+            for seq_id, seq in fasta.load_fasta(fasta_file)
+            if (seq_ids is None) or (seq_id in seq_ids)
+        }
+
+    fasta_file.seek(0)
+
+    return CachedFasta(fasta.MmapFasta(fasta_file))
+
+
+def add_exp_syn_count_cached(annotation, seqs, cache):
+    """
+    .. versionadded:: 0.5.8
+
+    Adds the expected syn/nonsyn counts to *annotation*, reusing the
+    counts computed for a previous annotation with the same coordinates
+    and strand (isoforms share them), so the codon walk runs once per
+    distinct interval.
+    """
+    key = (annotation.seq_id, annotation.start, annotation.end,
+           annotation.strand)
+
+    counts = cache.get(key)
+
+    if counts is None:
+        annotation.add_exp_syn_count(seqs[annotation.seq_id])
+        cache[key] = (annotation.exp_syn, annotation.exp_nonsyn)
     else:
-        pnps.to_csv(output_file)
+        annotation.set_attr('exp_syn', counts[0])
+        annotation.set_attr('exp_nonsyn', counts[1])
 
 
 def init_count_set(annotations, seqs):
@@ -357,6 +699,8 @@ def init_count_set(annotations, seqs):
         (sample, {}) for sample in samples
     )
 
+    exp_cache = {}
+
     for annotation in tqdm(annotations):
 
         taxon_id = annotation.taxon_id
@@ -364,16 +708,20 @@ def init_count_set(annotations, seqs):
         uid = annotation.uid
 
         sample_coverage = annotation.sample_coverage
-        annotation.add_exp_syn_count(seqs[annotation.seq_id])
+        add_exp_syn_count_cached(annotation, seqs, exp_cache)
 
-        for sample in sample_coverage:
+        gene_id = annotation.gene_id
+        exp_syn = annotation.exp_syn
+        exp_nonsyn = annotation.exp_nonsyn
+
+        for sample, coverage in sample_coverage.items():
             snp_data[sample][uid] = GeneSNP(
                 uid=uid,
-                gene_id=annotation.gene_id,
+                gene_id=gene_id,
                 taxon_id=taxon_id,
-                exp_syn=annotation.exp_syn,
-                exp_nonsyn=annotation.exp_nonsyn,
-                coverage=sample_coverage[sample],
+                exp_syn=exp_syn,
+                exp_nonsyn=exp_nonsyn,
+                coverage=coverage,
             )
 
     return snp_data
@@ -392,13 +740,19 @@ def init_count_set_sample_files(annotations, seqs, cov_files):
 
     annotations = list(itertools.chain(*annotations.values()))
 
+    exp_cache = {}
+
     for annotation in tqdm(annotations, desc="Adding Expected Values"):
-        annotation.add_exp_syn_count(seqs[annotation.seq_id])
+        add_exp_syn_count_cached(annotation, seqs, exp_cache)
 
     for sample, cov_file in tqdm(cov_files.items(), desc='Adding Coverage'):
-        cov_info = dict(
-            dictionary.text_to_dict(cov_file, value_func=float, skip_empty=True, skip_comment='#')
-        )
+        try:
+            cov_info = pandas.read_csv(
+                cov_file, sep='\t', header=None, comment='#',
+                names=['uid', 'cov'], index_col='uid'
+            )['cov'].to_dict()
+        except pandas.errors.EmptyDataError:
+            cov_info = {}
 
         for annotation in annotations:
 
@@ -416,18 +770,44 @@ def init_count_set_sample_files(annotations, seqs, cov_files):
 
     return snp_data
 
+def build_annotation_index(annotations):
+    """
+    .. versionadded:: 0.5.8
+
+    Converts grouped annotations (seq_id -> list of annotations) into
+    seq_id -> (starts, ends, annotations), with the coordinates held in
+    sorted numpy arrays, so finding the annotations overlapping a SNP is
+    a vectorised comparison instead of a Python test per annotation.
+    """
+    index = {}
+
+    for seq_id, ann_list in annotations.items():
+        ann_list = sorted(ann_list, key=lambda annotation: annotation.start)
+        index[seq_id] = (
+            numpy.array([annotation.start for annotation in ann_list]),
+            numpy.array([annotation.end for annotation in ann_list]),
+            ann_list
+        )
+
+    return index
+
+
 def check_snp_in_set(samples, snp_data, pos, change, annotations, seq):
     """
+    .. versionchanged:: 0.5.8
+        *annotations* is an element of :func:`build_annotation_index`
+
     Used by :func:`parse_vcf` to check if a SNP
 
     :param iterable samples: list of samples that contain the SNP
     :param dict snp_data: dictionary from :func:`init_count_set` with per
         sample SNPs information
     """
+    starts, ends, ann_list = annotations
 
-    for annotation in annotations:
-        if pos not in annotation:
-            continue
+    # overlapping annotations all get the SNP, as before
+    for index in numpy.nonzero((starts <= pos) & (pos <= ends))[0]:
+        annotation = ann_list[index]
 
         if annotation.is_syn(seq, pos, change, strict=False):
             snp_type = SNPType.syn
@@ -435,7 +815,9 @@ def check_snp_in_set(samples, snp_data, pos, change, annotations, seq):
             snp_type = SNPType.nonsyn
 
         uid = annotation.uid
-        rel_pos = annotation.get_relative_pos(pos)
+        # same as annotation.get_relative_pos(pos), without re-checking
+        # the containment just established by the overlap test
+        rel_pos = pos - int(starts[index]) + 1
 
         for sample in samples:
             snp_data[sample][uid].add_snp(rel_pos, change, snp_type=snp_type)
@@ -455,69 +837,85 @@ def parse_vcf(vcf_handle, snp_data, annotations, seqs, min_qual, min_reads, min_
     # indels
     skip_indels = 0
 
+    # line count at which the next progress line is emitted; avoids a
+    # modulo per record
+    next_log = 0
+
     for line_no, vcf_record in enumerate(vcf_handle):
-        if vcf_record.CHROM not in annotations:
+        if vcf_record.chrom not in annotations:
+            continue
+
+        if vcf_record.alts is None:
             continue
 
-        if vcf_record.is_indel:
+        # indels (or symbolic alleles) are not considered
+        if (len(vcf_record.ref) > 1) or \
+                any(len(alt) != 1 for alt in vcf_record.alts):
             continue
 
-        if vcf_record.INFO['DP'] < min_reads:
+        if vcf_record.info['DP'] < min_reads:
             # not enough reads (depth) for the SNP
             skip_dp += 1
             continue
 
-        if vcf_record.QUAL < min_qual:
+        if (vcf_record.qual is None) or (vcf_record.qual < min_qual):
             # low quality SNP
             skip_qual += 1
             continue
 
-        alleles_freq = dict(zip(map(str, vcf_record.ALT), vcf_record.aaf))
         # Used to keep track of the presence of an allele on which sample
         alleles_sample = {
             str(allele): set()
-            for allele in vcf_record.ALT
+            for allele in vcf_record.alts
         }
 
-        for sample_info in vcf_record.samples:
-            # equivalent to GT=. no call was made
-            if sample_info.gt_bases is None:
-                continue
-            # Not considering phases/unphased
-            # but we really are looking at haployd
-            # stress in documentation and examples
-            sample_info_gt = sample_info.gt_bases.replace('!', '/')
-            if '/' in sample_info_gt:
-                sample_info_gt = sample_info_gt.split('/')
-            # Haployd
-            else:
-                sample_info_gt = [sample_info_gt]
-
-            for change in sample_info_gt:
+        # allele frequencies are computed over the alleles of the called
+        # genotypes, like PyVCF's aaf did
+        allele_counts = {}
+        total_alleles = 0
+        sample_alleles = []
+
+        for sample_call in vcf_record.samples.values():
+            # alleles is empty (or None entries) when no call was made
+            called = [
+                allele
+                for allele in (sample_call.alleles or ())
+                if allele is not None
+            ]
+            total_alleles += len(called)
+            for allele in called:
+                allele_counts[allele] = allele_counts.get(allele, 0) + 1
+            sample_alleles.append((sample_call.name, called))
+
+        for sample_name, called in sample_alleles:
+            for change in called:
                 # if it's the reference continue
-                if change == vcf_record.REF:
+                if change == vcf_record.ref:
                     continue
-                allele_freq = alleles_freq.get(change, 0)
+                if change not in alleles_sample:
+                    continue
+                allele_freq = allele_counts[change] / total_alleles
                 if allele_freq < min_freq:
                     continue
-                alleles_sample[change].add(sample_ids[sample_info.sample])
+                alleles_sample[change].add(sample_ids[sample_name])
 
-        seq = seqs[vcf_record.CHROM]
-        ann_seq = annotations[vcf_record.CHROM]
+        seq = seqs[vcf_record.chrom]
+        ann_seq = annotations[vcf_record.chrom]
 
         for change, samples in alleles_sample.items():
             if not samples:
                 continue
-            check_snp_in_set(samples, snp_data, vcf_record.POS,
+            check_snp_in_set(samples, snp_data, vcf_record.pos,
                              change, ann_seq, seq)
             accepted_snps += 1
 
-        if verbose and (line_no % (num_lines) == 0):
+        if verbose and (line_no >= next_log):
             LOG.info(
                 "Line %d, SNPs passed %d; skipped for: qual %d, " +
                 "depth %d, freq %d, indels %d",
                 line_no, accepted_snps, skip_qual, skip_dp, skip_af, skip_indels
             )
+            next_log += num_lines
     if verbose:
         LOG.info(
             "Finished parsing, SNPs passed %d; skipped for: qual %d, " +
@@ -527,9 +925,69 @@ def parse_vcf(vcf_handle, snp_data, annotations, seqs, min_qual, min_reads, min_
     return accepted_snps, skip_qual, skip_dp, skip_af, skip_indels
 
 
+_VCF_WORKER_OPTIONS = None
+
+
+def _init_vcf_worker(annotations, seqs, min_qual, min_reads, min_freq,
+                     sample_ids, num_lines):
+    "Stores the data shared by :func:`_parse_vcf_worker` in the process"
+    global _VCF_WORKER_OPTIONS
+    # the memory-mapped reference cannot be pickled, so it is passed as
+    # the file name and indexed again in each worker
+    if isinstance(seqs, str):
+        seqs = CachedFasta(fasta.MmapFasta(seqs))
+    _VCF_WORKER_OPTIONS = (annotations, seqs, min_qual, min_reads, min_freq,
+                           sample_ids, num_lines)
+
+
+class _SNPRecorder(object):
+    "Collects the add_snp calls made while parsing a VCF in a worker"
+    __slots__ = ('snps',)
+
+    def __init__(self):
+        self.snps = []
+
+    def add_snp(self, position, change, snp_type=None):
+        self.snps.append((position, change, snp_type))
+
+
+def _parse_vcf_worker(vcf_file):
+    """
+    .. versionadded:: 0.5.8
+
+    Parses one VCF file in a worker process, recording the SNPs instead
+    of mutating the shared data; returns the recorded
+    (sample, uid, snps) tuples and the parse_vcf counters.
+    """
+    (annotations, seqs, min_qual, min_reads, min_freq, sample_ids,
+     num_lines) = _VCF_WORKER_OPTIONS
+
+    recorders = {
+        sample: collections.defaultdict(_SNPRecorder)
+        for sample in sample_ids.values()
+    }
+
+    stats = parse_vcf(pysam.VariantFile(vcf_file), recorders, annotations,
+                      seqs, min_qual, min_reads, min_freq, sample_ids,
+                      num_lines, verbose=False)
+
+    snps = [
+        (sample, uid, recorder.snps)
+        for sample, uid_dict in recorders.items()
+        for uid, recorder in uid_dict.items()
+    ]
+
+    return snps, stats
+
+
 def save_data(output_file, snp_data):
     """
-    Pickle data structures to the disk.
+    .. versionchanged:: 0.5.8
+        writes msgpack instead of pickle when the file name contains
+        *.msgpack*, and compresses the output when it ends in *.gz*,
+        *.bz2* or *.xz*
+
+    Serialise data structures to the disk.
 
     :param str output_file: base name for pickle files
     :param dict snp_data: dictionary from :func:`init_count_set` with per
@@ -537,7 +995,39 @@ def save_data(output_file, snp_data):
     """
 
     LOG.info("Saving sample SNPs to %s", output_file)
-    pickle.dump(snp_data, output_file, -1)
+
+    name = getattr(output_file, 'name', '')
+
+    # compresses the stream the same way open_file picks the module for
+    # the extension; the loaders go through open_file, so they detect it
+    if name.endswith('.gz'):
+        import gzip
+        output_file = gzip.GzipFile(fileobj=output_file, mode='wb')
+    elif name.endswith('.bz2'):
+        import bz2
+        output_file = bz2.BZ2File(output_file, 'wb')
+    elif name.endswith('.xz'):
+        import lzma
+        output_file = lzma.LZMAFile(output_file, 'wb')
+
+    if '.msgpack' in name:
+        import msgpack
+
+        msgpack.pack(
+            {
+                sample: {
+                    uid: gene.to_dict()
+                    for uid, gene in genes.items()
+                }
+                for sample, genes in snp_data.items()
+            },
+            output_file
+        )
+    else:
+        pickle.dump(snp_data, output_file, -1)
+
+    if name.endswith(('.gz', '.bz2', '.xz')):
+        output_file.close()
 
 
 @main.command('vcf', help="""parse a VCF file and a GFF file to produce the
@@ -561,18 +1051,19 @@ def save_data(output_file, snp_data):
               must be the same as in the GFF file''')
 @click.option('-n', '--num-lines', default=10**5, type=click.INT, show_default=True,
               help="Number of VCF lines after which printing status")
-@click.argument('vcf-file', type=click.File('r'), default='-')
+@click.argument('vcf-file', type=click.Path(file_okay=True, readable=True), default='-')
 @click.argument('output-file', type=click.File('wb'))
 def parse_command(verbose, feature, gff_file, fasta_file, min_qual, min_freq,
                   min_reads, sample_ids, num_lines, vcf_file, output_file):
 
     mgkit.logger.config_log(level=logging.DEBUG if verbose else logging.INFO)
 
-    vcf_handle = vcf.Reader(fsock=vcf_file)
+    vcf_handle = pysam.VariantFile(vcf_file)
+    vcf_samples = list(vcf_handle.header.samples)
 
-    if len(vcf_handle.samples) != len(sample_ids):
+    if len(vcf_samples) != len(sample_ids):
         utils.exit_script("The number of sample names is wrong: VCF ({}) -> Passed ({})".format(
-            ','.join(vcf_handle.samples), ','.join(sample_ids)), 1
+            ','.join(vcf_samples), ','.join(sample_ids)), 1
         )
 
     # Loads them as list because it's easier to init the data structure
@@ -597,23 +1088,21 @@ def parse_command(verbose, feature, gff_file, fasta_file, min_qual, min_freq,
 
     if set(annotations[0].sample_coverage.keys()) != set(sample_ids):
         utils.exit_script("The number of sample names is wrong: VCF ({}) -> Passed ({})".format(
-            ','.join(vcf_handle.samples), ','.join(sample_ids)), 1
+            ','.join(vcf_samples), ','.join(sample_ids)), 1
         )
 
-    sample_ids = dict(zip(vcf_handle.samples, sample_ids))
+    sample_ids = dict(zip(vcf_samples, sample_ids))
     LOG.info("Sample IDs from VCF to GFF: %r", sample_ids)
 
-    seqs = {
-        seq_id: seq
-        for seq_id, seq in fasta.load_fasta(fasta_file)
-        if seq_id in seq_ids
-    }
+    seqs = load_reference_seqs(fasta_file, seq_ids)
 
     snp_data = init_count_set(annotations, seqs)
 
-    annotations = gff.group_annotations(
-        annotations,
-        key_func=lambda x: x.seq_id
+    annotations = build_annotation_index(
+        gff.group_annotations(
+            annotations,
+            key_func=lambda x: x.seq_id
+        )
     )
 
     parse_vcf(vcf_handle, snp_data, annotations, seqs,
@@ -647,33 +1136,36 @@ def parse_command(verbose, feature, gff_file, fasta_file, min_qual, min_freq,
               help="File with list of VCF files (one per line)")
 @click.option('-u', '--uid-map', type=click.File('r'), default=None,
               help="Only load annotations from a specific map file")
+@click.option('-j', '--num-procs', default=1, type=click.IntRange(min=1),
+              show_default=True,
+              help='Number of processes used to parse multiple VCF files')
 @click.argument('vcf-file', type=click.Path(file_okay=True, readable=True), default='-')
 @click.argument('output-file', type=click.File('wb'))
 def parse_alt_command(verbose, feature, gff_file, fasta_file, min_qual, min_freq,
-                  min_reads, num_lines, sample_file, file_list, uid_map, vcf_file, output_file):
+                  min_reads, num_lines, sample_file, file_list, uid_map, num_procs,
+                  vcf_file, output_file):
 
     mgkit.logger.config_log(level=logging.DEBUG if verbose else logging.INFO)
 
     if file_list is None:
-        vcf_handles = [vcf.Reader(fsock=open(vcf_file, 'r'))]
+        vcf_files = [vcf_file]
     else:
-        vcf_handles = [
-            vcf.Reader(fsock=open(line.strip(), 'r'))
-            for line in file_list
-        ]
+        vcf_files = [line.strip() for line in file_list]
 
     cov_files = OrderedDict()
     for line in sample_file:
         sample_id, cov_file = line.strip().split('\t')
         cov_files[sample_id] = open(cov_file, 'r')
 
-    if len(vcf_handles[0].samples) != len(cov_files):
+    vcf_samples = list(pysam.VariantFile(vcf_files[0]).header.samples)
+
+    if len(vcf_samples) != len(cov_files):
         utils.exit_script("The number of sample names is wrong: VCF ({}) -> Passed ({})".format(
-            ','.join(vcf_handles[0].samples), ','.join(cov_files)), 1
+            ','.join(vcf_samples), ','.join(cov_files)), 1
         )
-    
+
     LOG.info("VCF sample ID -> Sample ID")
-    sample_ids = dict(zip(vcf_handles[0].samples, cov_files))
+    sample_ids = dict(zip(vcf_samples, cov_files))
     for vcf_sample, sample_id in sample_ids.items():
         LOG.info("%s -> %s", vcf_sample, sample_id)
 
@@ -698,28 +1190,64 @@ def parse_alt_command(verbose, feature, gff_file, fasta_file, min_qual, min_freq
         key_func=lambda x: x.seq_id
     )
 
-    seqs = {
-        seq_id: seq
-        for seq_id, seq in fasta.load_fasta(fasta_file)
-        if seq_id in annotations
-    }
+    seqs = load_reference_seqs(fasta_file, annotations)
 
     snp_data = init_count_set_sample_files(annotations, seqs, cov_files)
 
-    if len(vcf_handles) > 1:
-        vcf_handles = tqdm(vcf_handles, desc="Parsing VCF Files")
-    
-    accepted_snps, skip_qual, skip_dp, skip_af, skip_indels = 0, 0, 0, 0, 0
-    for vcf_handle in vcf_handles:
-        accepted_snps, skip_qual, skip_dp, skip_af, skip_indels = parse_vcf(
-                  vcf_handle, snp_data, annotations, seqs,
-                  min_qual, min_reads, min_freq, sample_ids, num_lines,
-                  verbose=True if len(vcf_handles) == 1 else False)
-        accepted_snps += accepted_snps
-        skip_qual += skip_qual
-        skip_dp += skip_dp
-        skip_af += skip_af
-        skip_indels += skip_indels
+    annotations = build_annotation_index(annotations)
+
+    if (num_procs > 1) and (len(vcf_files) > 1):
+        # each VCF file is independent: workers parse them concurrently
+        # (shared data is sent once per worker) and return the recorded
+        # SNPs, merged here in file order to keep the output
+        # deterministic
+        LOG.info("Parsing %d VCF files with %d processes", len(vcf_files),
+                 num_procs)
+
+        # a CachedFasta holds an mmap, which cannot be pickled to the
+        # workers (spawn/forkserver start methods): they get the file
+        # name and rebuild the index in the initializer
+        if isinstance(seqs, CachedFasta):
+            seqs_arg = fasta_file.name
+        else:
+            seqs_arg = seqs
+
+        init_args = (annotations, seqs_arg, min_qual, min_reads, min_freq,
+                     sample_ids, num_lines)
+
+        totals = [0, 0, 0, 0, 0]
+
+        with multiprocessing.Pool(min(num_procs, len(vcf_files)),
+                                  initializer=_init_vcf_worker,
+                                  initargs=init_args) as pool:
+            for snps, stats in tqdm(pool.imap(_parse_vcf_worker, vcf_files),
+                                    desc="Parsing VCF Files",
+                                    total=len(vcf_files)):
+                for sample, uid, snp_list in snps:
+                    gene = snp_data[sample][uid]
+                    for position, change, snp_type in snp_list:
+                        gene.add_snp(position, change, snp_type=snp_type)
+                totals = [
+                    total + value
+                    for total, value in zip(totals, stats)
+                ]
+
+        accepted_snps, skip_qual, skip_dp, skip_af, skip_indels = totals
+    else:
+        vcf_handles = [pysam.VariantFile(vcf_file) for vcf_file in vcf_files]
+
+        if len(vcf_handles) > 1:
+            vcf_handles = tqdm(vcf_handles, desc="Parsing VCF Files")
+
+        totals = [0, 0, 0, 0, 0]
+        for vcf_handle in vcf_handles:
+            stats = parse_vcf(
+                      vcf_handle, snp_data, annotations, seqs,
+                      min_qual, min_reads, min_freq, sample_ids, num_lines,
+                      verbose=True if len(vcf_files) == 1 else False)
+            totals = [total + value for total, value in zip(totals, stats)]
+
+        accepted_snps, skip_qual, skip_dp, skip_af, skip_indels = totals
 
     if not verbose:
         LOG.info(
@@ -13,7 +13,8 @@ except KeyError:
 
 ext = '.pyx' if USE_CYTHON else '.c'
 extensions = [
-    Extension("mgkit.utils._sequence", ["mgkit/utils/_sequence" + ext])
+    Extension("mgkit.utils._sequence", ["mgkit/utils/_sequence" + ext]),
+    Extension("mgkit.io._gff_attr", ["mgkit/io/_gff_attr" + ext])
 ]
 
 if USE_CYTHON:
@@ -38,7 +39,6 @@ install_requires = [
     'networkx',
     'future',
     'requests',
-    'PyVCF>=0.6.0',
     'click>=6',
     #support for enum backported from Python 3.4
     'enum34;python_version<"3.4"',
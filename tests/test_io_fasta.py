@@ -100,3 +100,39 @@ def test_load_fasta_rename2(oneseq):
     nam_func = lambda x: x.split('.')[0]
     seq_id, seq = next(fasta.load_fasta_rename(oneseq, name_func=nam_func))
     assert seq_id == 'M95099'
+
+
+def test_mmap_fasta1(nucseq):
+    mmap_fasta = fasta.MmapFasta(nucseq)
+    assert dict(fasta.load_fasta(nucseq)) == {
+        seq_id: mmap_fasta[seq_id]
+        for seq_id in mmap_fasta
+    }
+
+
+def test_mmap_fasta2(nucseq):
+    mmap_fasta = fasta.MmapFasta(nucseq)
+    assert len(mmap_fasta) == 115
+
+
+def test_mmap_fasta3(nucseq):
+    mmap_fasta = fasta.MmapFasta(nucseq)
+    assert 'contig-1467318' in mmap_fasta
+
+
+def test_mmap_fasta_lengths(nucseq):
+    mmap_fasta = fasta.MmapFasta(nucseq)
+    assert mmap_fasta.lengths() == {
+        seq_id: len(seq)
+        for seq_id, seq in fasta.load_fasta(nucseq)
+    }
+    assert mmap_fasta.length('contig-1467318') == \
+        len(mmap_fasta['contig-1467318'])
+
+
+def test_mmap_fasta_rename(tmpdir):
+    file_name = (tmpdir / 'test.fa').strpath
+    open(file_name, 'w').write('>seq1 description\nACTG\nACTG\n')
+
+    mmap_fasta = fasta.MmapFasta(file_name, rename=True)
+    assert mmap_fasta['seq1'] == 'ACTGACTG'
@@ -1,5 +1,6 @@
 import pytest
 import pathlib
+import pandas
 from mgkit.io import gff, fasta
 from mgkit.io import open_file
 from mgkit.utils import sequence
@@ -888,3 +889,45 @@ def test_genomicrange_length2():
     ann = gff.GenomicRange(start=1, end=10)
     with pytest.raises(AttributeError):
         ann.length
+
+
+def test_load_gff_dataframe(shared_datadir):
+    file_name = str(shared_datadir / 'test.gff')
+
+    dataframe = gff.load_gff_dataframe(file_name)
+    annotations = list(gff.parse_gff(file_name))
+
+    assert len(dataframe) == len(annotations)
+    assert dataframe['seq_id'].tolist() == [
+        annotation.seq_id for annotation in annotations
+    ]
+    assert dataframe['start'].tolist() == [
+        annotation.start for annotation in annotations
+    ]
+    assert dataframe['ko'].tolist() == [
+        annotation.attr['ko'] for annotation in annotations
+    ]
+
+    # the directive line in the fixture must not upcast the coordinate
+    # columns to float through NaN padding
+    assert dataframe['start'].dtype == 'int64'
+    assert dataframe['end'].dtype == 'int64'
+    assert dataframe['phase'].dtype == 'int64'
+
+
+def test_load_gff_dataframe_attributes(shared_datadir):
+    file_name = str(shared_datadir / 'test.gff')
+
+    dataframe = gff.load_gff_dataframe(file_name, attributes={'ko'})
+
+    assert 'ko' in dataframe.columns
+    assert 'aa_seq' not in dataframe.columns
+
+
+def test_load_gff_dataframe_num_procs(shared_datadir):
+    file_name = str(shared_datadir / 'test.gff')
+
+    pandas.testing.assert_frame_equal(
+        gff.load_gff_dataframe(file_name),
+        gff.load_gff_dataframe(file_name, num_procs=2)
+    )
@@ -0,0 +1,66 @@
+import gzip
+import os
+
+import pytest
+import requests
+
+from mgkit.net import utils
+
+
+class FakeResponse(object):
+    def __init__(self, status_code, text, headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = {} if headers is None else headers
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(str(self.status_code))
+
+
+@pytest.fixture
+def fake_url_open(monkeypatch):
+    calls = []
+    responses = []
+
+    def url_open(url, data=None, headers=None, agent=None, get=True,
+                 stream=False):
+        calls.append(url)
+        return responses.pop(0)
+
+    monkeypatch.setattr(utils, 'url_open', url_open)
+
+    return calls, responses
+
+
+def test_url_read_cached(fake_url_open, tmpdir):
+    calls, responses = fake_url_open
+    responses.append(FakeResponse(200, 'BODY'))
+
+    assert utils.url_read_cached('http://x/a', cache_dir=tmpdir.strpath) == \
+        'BODY'
+    # the second call is served from the cache, without a request
+    assert utils.url_read_cached('http://x/a', cache_dir=tmpdir.strpath) == \
+        'BODY'
+    assert len(calls) == 1
+
+
+def test_url_read_cached_retry(fake_url_open, tmpdir):
+    calls, responses = fake_url_open
+    responses.append(FakeResponse(429, 'limited', {'Retry-After': '0'}))
+    responses.append(FakeResponse(200, 'BODY'))
+
+    assert utils.url_read_cached('http://x/a', cache_dir=tmpdir.strpath) == \
+        'BODY'
+    assert len(calls) == 2
+
+
+def test_url_read_cached_error(fake_url_open, tmpdir):
+    calls, responses = fake_url_open
+    responses.append(FakeResponse(404, 'missing'))
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        utils.url_read_cached('http://x/a', cache_dir=tmpdir.strpath)
+
+    # the error page must not be written to the cache
+    assert os.listdir(tmpdir.strpath) == []
@@ -0,0 +1,102 @@
+import pickle
+
+import pysam
+import pytest
+
+from mgkit.io import fasta, gff
+from mgkit.snps.classes import GeneSNP, SNPType
+from mgkit.workflow import pnps_gen
+
+# 27 bases, a single CDS covering the whole sequence in frame
+REF_SEQ = 'ATGGCATTTGGCAAACCCGGGTTTTAA'
+
+GFF_LINE = (
+    'c1\ttest\tCDS\t1\t27\t0.0\t+\t0\t'
+    'uid="u1";gene_id="g1";taxon_id="2";s1_cov="10";s2_cov="8"\n'
+)
+
+# pos 6 A>G is synonymous (only called in S1), pos 7 T>C is
+# non-synonymous (called in both), pos 8 fails the quality filter and
+# pos 9 the depth filter
+VCF_FILE = """##fileformat=VCFv4.2
+##INFO=<ID=DP,Number=1,Type=Integer,Description="Total Depth">
+##FORMAT=<ID=GT,Number=1,Type=String,Description="Genotype">
+##contig=<ID=c1,length=27>
+#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tS1\tS2
+c1\t6\t.\tA\tG\t60\tPASS\tDP=20\tGT\t1\t0
+c1\t7\t.\tT\tC\t60\tPASS\tDP=20\tGT\t1\t1
+c1\t8\t.\tT\tA\t5\tPASS\tDP=20\tGT\t1\t1
+c1\t9\t.\tT\tG\t60\tPASS\tDP=2\tGT\t1\t1
+"""
+
+
+@pytest.fixture
+def vcf_files(tmp_path):
+    fasta_file = tmp_path / 'ref.fa'
+    fasta_file.write_text('>c1\n{}\n'.format(REF_SEQ))
+
+    gff_file = tmp_path / 'ann.gff'
+    gff_file.write_text(GFF_LINE)
+
+    vcf_file = tmp_path / 'in.vcf'
+    vcf_file.write_text(VCF_FILE)
+
+    return fasta_file, gff_file, vcf_file
+
+
+def test_parse_vcf(vcf_files):
+    fasta_file, gff_file, vcf_file = vcf_files
+
+    annotations = list(gff.parse_gff(str(gff_file)))
+    seqs = dict(fasta.load_fasta(str(fasta_file)))
+
+    snp_data = pnps_gen.init_count_set(annotations, seqs)
+
+    index = pnps_gen.build_annotation_index(
+        gff.group_annotations(annotations, key_func=lambda x: x.seq_id)
+    )
+
+    stats = pnps_gen.parse_vcf(
+        pysam.VariantFile(str(vcf_file)), snp_data, index, seqs,
+        min_qual=30, min_reads=4, min_freq=0.01,
+        sample_ids={'S1': 's1', 'S2': 's2'}, num_lines=10**5, verbose=False
+    )
+
+    # (accepted, skip_qual, skip_dp, skip_af, skip_indels)
+    assert stats == (2, 1, 1, 0, 0)
+
+    assert snp_data['s1']['u1'].snps == [
+        (6, 'G', SNPType.syn), (7, 'C', SNPType.nonsyn)
+    ]
+    assert snp_data['s2']['u1'].snps == [(7, 'C', SNPType.nonsyn)]
+
+    # coverage comes from the GFF sample attributes
+    assert snp_data['s1']['u1'].coverage == 10
+    assert snp_data['s2']['u1'].coverage == 8
+
+
+@pytest.mark.parametrize(
+    'suffix', ['.pickle', '.msgpack', '.pickle.gz', '.msgpack.gz',
+               '.pickle.bz2', '.pickle.xz']
+)
+def test_snp_data_round_trip(tmp_path, suffix):
+    gene = GeneSNP(uid='u1', gene_id='g1', taxon_id=5, exp_syn=4,
+                   exp_nonsyn=6, coverage=9)
+    gene.add_snp(3, 'A', SNPType.syn)
+    gene.add_snp(5, 'C', SNPType.nonsyn)
+
+    snp_data = {'s1': {'u1': gene}}
+
+    file_name = str(tmp_path / ('snp-data' + suffix))
+    with open(file_name, 'wb') as file_handle:
+        pnps_gen.save_data(file_handle, snp_data)
+
+    loaded = pnps_gen.load_snp_data(file_name)['s1']['u1']
+
+    assert loaded.uid == gene.uid
+    assert loaded.gene_id == gene.gene_id
+    assert loaded.taxon_id == gene.taxon_id
+    assert loaded.exp_syn == gene.exp_syn
+    assert loaded.exp_nonsyn == gene.exp_nonsyn
+    assert loaded.coverage == gene.coverage
+    assert loaded.snps == gene.snps
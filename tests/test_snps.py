@@ -6,6 +6,7 @@ from mgkit.snps.funcs import combine_sample_snps, flat_sample_snps
 from mgkit.snps.conv_func import get_rank_dataframe, get_full_dataframe
 
 import numpy
+import pandas
 
 
 def test_genesyn_calc_ratio1():
@@ -446,3 +447,11 @@ def test_get_full_dataframe(ncbi_taxonomy):
     assert numpy.isnan(df.loc[('gene2', 838), 'sample2'])
     assert df.loc[('gene1', 839), 'sample1'] == 1.
     assert df.loc[('gene1', 839), 'sample2'] == .375
+
+
+def test_combine_sample_snps_num_procs():
+    # the parallel path must return the same frame as the serial one
+    pandas.testing.assert_frame_equal(
+        combine_sample_snps(SNP_DATA, 1, []),
+        combine_sample_snps(SNP_DATA, 1, [], num_procs=2)
+    )
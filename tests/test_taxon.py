@@ -235,3 +235,11 @@ def test_taxonomy_contains(taxonomy):
 
 def test_taxonomy_repr(taxonomy):
     assert repr(taxonomy) == "<class 'mgkit.taxon.Taxonomy'> - 90 taxa"
+
+
+def test_taxonomy_get_names(taxonomy):
+    taxon_ids = [taxon.taxon_id for taxon in taxonomy][:5]
+    assert taxonomy.get_names(taxon_ids) == [
+        taxonomy[taxon_id].s_name
+        for taxon_id in taxon_ids
+    ]